@@ -6,8 +6,8 @@ A modular multimodal assistant for building multi-agent frameworks.
 """
 
 from .main import MultimodalAssistant
-from .audio_handler import AudioHandler
-from .gemini_client import GeminiClient
+from .audio_handler import AudioHandler, get_audio_handler
+from .gemini_client import GeminiClient, get_gemini_client
 from .tools import TOOLS_SPEC, FUNCTION_REGISTRY, execute_function
 from . import config
 
@@ -18,6 +18,8 @@ __all__ = [
     "MultimodalAssistant",
     "AudioHandler", 
     "GeminiClient",
+    "get_audio_handler",
+    "get_gemini_client",
     "TOOLS_SPEC",
     "FUNCTION_REGISTRY",
     "execute_function",
@@ -4,9 +4,9 @@ Base agent class for the MultiModal Assistant multi-agent system.
 Provides common functionality and command bus integration.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Optional
 from abc import ABC, abstractmethod
-from bus import emit_action, ActionTypes
+from bus import emit_action, get_command_bus, ActionTypes, CommandBus
 
 
 class BaseAgent(ABC):
@@ -15,6 +15,27 @@ class BaseAgent(ABC):
     Provides command bus integration and common functionality.
     """
     
+    # Upstream result keys this agent reads in a chain workflow. By default an
+    # agent takes the previous agent's "formatted_response" as its task; agents
+    # that only need the original task declare an empty set and may run in
+    # parallel with their predecessors.
+    consumes: FrozenSet[str] = frozenset({"formatted_response"})
+    
+    # Result keys this agent may set that downstream chain agents can consume.
+    # A chain agent waits only for earlier agents whose produces overlaps its consumes.
+    produces: FrozenSet[str] = frozenset({"formatted_response"})
+    
+    # Chain workflows pass context as a read-only ChainMap of upstream results;
+    # agents that need a plain dict (e.g. to serialize or mutate it) set this
+    wants_flat_context: bool = False
+    
+    # Most runs of this agent a workflow allows at once; None leaves it to the
+    # workflow's agent_concurrency. Agents with per-run instance state set 1.
+    max_concurrency: Optional[int] = None
+    
+    # Global command bus, resolved on the first emit and shared by every agent
+    _command_bus: Optional[CommandBus] = None
+    
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
@@ -31,10 +52,10 @@ class BaseAgent(ABC):
         Returns:
             Action ID
         """
-        from bus import get_command_bus
         try:
-            bus = await get_command_bus()
-            return bus.emit(action, data, source=self.name)
+            if BaseAgent._command_bus is None:
+                BaseAgent._command_bus = await get_command_bus()
+            return BaseAgent._command_bus.emit(action, data, source=self.name)
         except Exception as e:
             print(f"❌ Error emitting from {self.name}: {e}")
             return ""
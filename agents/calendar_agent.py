@@ -16,6 +16,9 @@ class CalendarAgent(BaseAgent):
     Demonstrates how to add new domain-specific agents.
     """
     
+    # Works from the user's original request, not upstream prose
+    consumes = frozenset()
+    
     def __init__(self):
         super().__init__(
             name="CalendarAgent",
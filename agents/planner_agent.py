@@ -4,12 +4,14 @@ Planner Agent for the MultiModal Assistant.
 Refactored from main.py to use ADK and command bus architecture.
 """
 
+import asyncio
 from typing import Dict, Any, Optional
 import json
 from .base_agent import BaseAgent
-from gemini_client import GeminiClient
-from audio_handler import AudioHandler
-from bus import ActionTypes
+from gemini_client import get_gemini_client
+from audio_handler import get_audio_handler
+from bus import ActionTypes, truncate_text
+from config import SYSTEM_MESSAGE
 
 
 class PlannerAgent(BaseAgent):
@@ -18,13 +20,17 @@ class PlannerAgent(BaseAgent):
     This agent contains the core conversation logic from the original main.py.
     """
     
+    # Each run resets conversation_history and the Gemini chat, which every
+    # run shares, so concurrent runs would clobber each other
+    max_concurrency = 1
+    
     def __init__(self):
         super().__init__(
             name="PlannerAgent",
             description="Main orchestrator for conversations, tool routing, and audio generation"
         )
-        self.gemini_client = GeminiClient()
-        self.audio_handler = AudioHandler()
+        self.gemini_client = get_gemini_client()
+        self.audio_handler = get_audio_handler()
         self.conversation_history = []
         
     async def run(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -70,8 +76,6 @@ class PlannerAgent(BaseAgent):
     
     def _initialize_conversation(self, user_prompt: str):
         """Initialize the conversation with system message and user prompt."""
-        from config import SYSTEM_MESSAGE
-        
         self.gemini_client.initialize_chat(SYSTEM_MESSAGE)
         self.conversation_history = [
             {"role": "system", "content": SYSTEM_MESSAGE},
@@ -96,8 +100,10 @@ class PlannerAgent(BaseAgent):
             "stage": "thinking"
         })
         
-        # Send message to Gemini
-        response_text, function_name, function_args = self.gemini_client.send_message_with_streaming(user_prompt)
+        # Send message to Gemini off the event loop so bus events keep flowing
+        response_text, function_name, function_args = await asyncio.to_thread(
+            self.gemini_client.send_message_with_streaming, user_prompt
+        )
         
         # Emit the assistant's response
         if response_text:
@@ -145,7 +151,7 @@ class PlannerAgent(BaseAgent):
             })
             
             # Execute the tool
-            tool_result = self.gemini_client.execute_tool_call(function_name, function_args)
+            tool_result = await self.gemini_client.execute_tool_call_async(function_name, function_args)
             
             # Emit tool completion
             await self.emit(ActionTypes.TOOL_COMPLETE, {
@@ -154,7 +160,9 @@ class PlannerAgent(BaseAgent):
             })
             
             # Send tool result back to Gemini and get final response
-            final_response = self.gemini_client.send_tool_result(function_name, function_args, tool_result)
+            final_response = await asyncio.to_thread(
+                self.gemini_client.send_tool_result, function_name, function_args, tool_result
+            )
             
             # Emit final response
             if final_response:
@@ -197,20 +205,20 @@ class PlannerAgent(BaseAgent):
         """
         # Emit audio generation start
         await self.emit(ActionTypes.AUDIO_START, {
-            "text": text[:100] + "..." if len(text) > 100 else text
+            "text": truncate_text(text)
         })
         
         try:
             # Generate audio using Gemini 2.5 TTS
-            audio_data = self.gemini_client.generate_tts_audio(text)
+            audio_data = await asyncio.to_thread(self.gemini_client.generate_tts_audio, text)
             
             if audio_data:
-                # Convert and play audio
-                self.audio_handler.play_pcm_audio(audio_data)
+                # Convert and play audio; playback blocks until done, so keep it off the loop
+                await asyncio.to_thread(self.audio_handler.play_pcm_audio, audio_data)
                 
                 # Emit audio completion
                 await self.emit(ActionTypes.AUDIO_COMPLETE, {
-                    "text": text[:100] + "..." if len(text) > 100 else text,
+                    "text": truncate_text(text),
                     "success": True
                 })
             else:
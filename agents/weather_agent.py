@@ -4,24 +4,49 @@ Weather Agent for the MultiModal Assistant.
 Specialized agent for weather-related queries and data retrieval.
 """
 
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import copy
 import json
+import re
+import time
 from .base_agent import BaseAgent
-from tools import get_current_weather
+from tools import execute_function_async
 from bus import ActionTypes
 
 
+# Query words removed, in one pass, when a location has to be pulled out of free text
+_LOCATION_STOPWORDS_RE = re.compile(
+    r"\b(?:what's|what|how's|how|is|the|weather|temperature|forecast|climate|check|get|like|in|for|at)\b",
+    re.IGNORECASE
+)
+
+# How long, in seconds, a location's weather data is reused before it is fetched again
+WEATHER_CACHE_TTL = 30.0
+
+# Maximum number of locations whose weather data is kept
+WEATHER_CACHE_SIZE = 256
+
+
 class WeatherAgent(BaseAgent):
     """
     Specialized agent for weather information retrieval.
     Demonstrates domain-specific agent pattern.
     """
     
-    def __init__(self):
+    # Works from the user's original request, not upstream prose
+    consumes = frozenset()
+    
+    def __init__(self, cache_ttl: float = WEATHER_CACHE_TTL, cache_size: int = WEATHER_CACHE_SIZE):
         super().__init__(
             name="WeatherAgent", 
             description="Specialized agent for weather data retrieval and analysis"
         )
+        # Recent get_current_weather results: location -> (fetched_at, weather_data).
+        # Only the tool call is cached; run() still emits its events on every request
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._weather_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         
     async def run(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -53,7 +78,7 @@ class WeatherAgent(BaseAgent):
             })
             
             # Get weather data
-            weather_data = get_current_weather(location)
+            weather_data = await self._get_weather(location)
             
             # Format the response
             formatted_response = self._format_weather_response(weather_data)
@@ -82,6 +107,31 @@ class WeatherAgent(BaseAgent):
             await self.notify_error(error_msg)
             return {"error": error_msg}
     
+    async def _get_weather(self, location: str) -> Dict[str, Any]:
+        """
+        Fetch weather data for a location, reusing a recent result for the same location.
+        
+        Args:
+            location: Location to look up
+            
+        Returns:
+            Weather data; a copy the caller may modify
+        """
+        cached: Optional[Tuple[float, Dict[str, Any]]] = self._weather_cache.get(location)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            self._weather_cache.move_to_end(location)
+            return copy.deepcopy(cached[1])
+        
+        weather_data = await execute_function_async("get_current_weather", location=location)
+        
+        # Only successful lookups are reused; errors are retried on the next request
+        if isinstance(weather_data, dict) and "error" not in weather_data:
+            self._weather_cache[location] = (time.monotonic(), copy.deepcopy(weather_data))
+            self._weather_cache.move_to_end(location)
+            if len(self._weather_cache) > self.cache_size:
+                self._weather_cache.popitem(last=False)
+        return weather_data
+    
     def _extract_location(self, task: str, context: Dict[str, Any] = None) -> str:
         """
         Extract location from task string or context.
@@ -110,9 +160,10 @@ class WeatherAgent(BaseAgent):
                 except json.JSONDecodeError:
                     pass
         
-        # Fallback: treat entire task as location
+        # Fallback: treat the task, minus query words, as the location
         # This is a simple approach - in production, you might use NLP to extract location
-        return task.strip()
+        location = " ".join(_LOCATION_STOPWORDS_RE.sub(" ", task).split()).strip(" ?.!,")
+        return location or task.strip()
     
     def _format_weather_response(self, weather_data: Dict[str, Any]) -> str:
         """
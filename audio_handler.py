@@ -6,10 +6,11 @@ Manages audio streaming, processing, and playback.
 
 import base64
 import math
+import threading
 import numpy as np
 import sounddevice as sd
 from scipy.signal import resample_poly
-from typing import List
+from typing import List, Optional
 from config import API_SAMPLE_RATE, CHANNELS
 
 
@@ -19,6 +20,9 @@ class AudioHandler:
     def __init__(self):
         self.all_audio_data: List[np.ndarray] = []
         self.device_sample_rate = None
+        # Playback may run on worker threads; sounddevice cuts off the current
+        # clip when a new one starts, so plays take turns
+        self._playback_lock = threading.Lock()
     
     def detect_device_sample_rate(self) -> None:
         """Detect the actual sample rate the device will use."""
@@ -172,19 +176,17 @@ class AudioHandler:
                 print("⚠️  No audio data to play")
                 return
                 
-            # Convert PCM16 bytes to numpy array
-            # Ensure data length is even (for int16)
-            if len(pcm_data) % 2 != 0:
-                pcm_data = pcm_data[:-1]
-            
-            audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+            # Convert PCM16 bytes to numpy array without copying; count drops a
+            # trailing odd byte instead of slicing a new bytes object
+            audio_array = np.frombuffer(pcm_data, dtype=np.int16, count=len(pcm_data) // 2)
             
             if len(audio_array) == 0:
                 print("⚠️  Empty audio data")
                 return
             
             # Convert to float32 for sounddevice (range -1.0 to 1.0)
-            audio_float = audio_array.astype(np.float32) / 32768.0
+            audio_float = audio_array.astype(np.float32)
+            audio_float *= 1.0 / 32768.0  # Scale in place rather than allocating a second array
             
             # Gemini TTS outputs at 24kHz mono
             sample_rate = 24000
@@ -192,8 +194,21 @@ class AudioHandler:
             print("🔊 Playing audio...")
             
             # Play the audio 
-            sd.play(audio_float, samplerate=sample_rate)
-            sd.wait()  # Wait for playback to complete
+            with self._playback_lock:
+                sd.play(audio_float, samplerate=sample_rate)
+                sd.wait()  # Wait for playback to complete
             
         except Exception as e:
-            print(f"❌ Error processing audio data: {e}") 
\ No newline at end of file
+            print(f"❌ Error processing audio data: {e}")
+
+
+# Shared handler instance so concurrent callers never contend for the output device
+_audio_handler: Optional[AudioHandler] = None
+
+
+def get_audio_handler() -> AudioHandler:
+    """Get the shared audio handler, creating it on first use."""
+    global _audio_handler
+    if _audio_handler is None:
+        _audio_handler = AudioHandler()
+    return _audio_handler
@@ -5,10 +5,11 @@ Provides an in-process event queue that decouples agents from transport.
 """
 
 import asyncio
-import json
+import sys
 import uuid
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+import orjson
+from typing import Dict, Any, Iterable, List, Optional
+from dataclasses import dataclass
 from datetime import datetime
 
 
@@ -28,6 +29,55 @@ class BusAction:
             self.timestamp = datetime.utcnow().isoformat()
 
 
+# Per-subscriber buffer size; when full, status/progress updates are shed first
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Maximum number of queued actions coalesced into one streamed frame
+ACTION_BATCH_SIZE = 64
+
+
+class SubscriberQueue(asyncio.Queue):
+    """
+    Bounded subscriber queue that sheds low-priority actions under backpressure.
+    Items are stored as (droppable, action_json); consumers receive action_json.
+    """
+    
+    def __init__(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.dropped = 0
+        
+    def _get(self):
+        return self._queue.popleft()[1]
+    
+    def offer(self, action_json: str, droppable: bool = False):
+        """
+        Queue an action without blocking. When the queue is full, the oldest
+        droppable action is evicted; if none is queued, a droppable action is
+        discarded, and any other action evicts the oldest queued action.
+        Every shed action is counted in dropped.
+        
+        Args:
+            action_json: Serialized action
+            droppable: Whether this action may be shed under backpressure
+        """
+        if self.full():
+            for index, (queued_droppable, _) in enumerate(self._queue):
+                if queued_droppable:
+                    del self._queue[index]
+                    break
+            else:
+                if droppable:
+                    # Nothing older to shed, drop the incoming update instead
+                    self.dropped += 1
+                    return
+                # Drop-oldest: the subscriber stays registered and keeps receiving new actions
+                self._queue.popleft()
+            self.task_done()
+            self.dropped += 1
+        
+        self.put_nowait((droppable, action_json))
+
+
 class CommandBus:
     """
     In-process event queue that enables loose coupling between agents and UI.
@@ -36,7 +86,8 @@ class CommandBus:
     
     def __init__(self):
         self._queue: asyncio.Queue = asyncio.Queue()
-        self._subscribers: List[asyncio.Queue] = []
+        self._subscribers: List[SubscriberQueue] = []  # Receive every action
+        self._subscribers_by_type: Dict[str, List[SubscriberQueue]] = {}
         self._running = False
         
     async def start(self):
@@ -62,12 +113,13 @@ class CommandBus:
         """
         bus_action = BusAction(action=action, data=data, source=source)
         
-        # Convert to JSON string for transport
-        action_json = json.dumps(asdict(bus_action))
+        # Convert to JSON string for transport (orjson serializes the dataclass
+        # directly, without the deep copy asdict() makes)
+        action_json = orjson.dumps(bus_action, option=orjson.OPT_NON_STR_KEYS).decode()
         
         # Add to queue (non-blocking)
         try:
-            self._queue.put_nowait(action_json)
+            self._queue.put_nowait((action, action_json))
         except asyncio.QueueFull:
             print(f"⚠️ Command bus queue full, dropping action: {action}")
             
@@ -76,43 +128,98 @@ class CommandBus:
     async def get_next_action(self) -> Optional[str]:
         """Get the next action from the queue (blocking)."""
         try:
-            return await self._queue.get()
+            _, action_json = await self._queue.get()
+            self._queue.task_done()
+            return action_json
         except Exception:
             return None
     
-    def subscribe(self) -> asyncio.Queue:
+    async def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every emitted action has been handed to subscribers.
+        
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+            
+        Returns:
+            True if the bus drained, False if the timeout expired first
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def subscribe(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE, types: Optional[Iterable[str]] = None) -> SubscriberQueue:
         """
         Subscribe to command bus events.
-        Returns a queue that will receive all emitted actions.
+        Returns a bounded queue that will receive emitted actions.
+        
+        Args:
+            maxsize: Maximum number of undelivered actions buffered for this subscriber
+            types: Action types to receive; None receives every action
         """
-        subscriber_queue = asyncio.Queue()
-        self._subscribers.append(subscriber_queue)
+        subscriber_queue = SubscriberQueue(maxsize)
+        if types is None:
+            self._subscribers.append(subscriber_queue)
+        else:
+            for action in set(types):
+                self._subscribers_by_type.setdefault(action, []).append(subscriber_queue)
         return subscriber_queue
     
     def unsubscribe(self, subscriber_queue: asyncio.Queue):
         """Unsubscribe from command bus events."""
         if subscriber_queue in self._subscribers:
             self._subscribers.remove(subscriber_queue)
+        for action, subscribers in list(self._subscribers_by_type.items()):
+            if subscriber_queue in subscribers:
+                subscribers.remove(subscriber_queue)
+                if not subscribers:
+                    del self._subscribers_by_type[action]
+    
+    def _all_subscribers(self) -> List[SubscriberQueue]:
+        """Every subscriber queue, each listed once."""
+        # dict keys dedupe in O(1) per queue while keeping registration order
+        subscribers = dict.fromkeys(self._subscribers)
+        for typed_subscribers in self._subscribers_by_type.values():
+            subscribers.update(dict.fromkeys(typed_subscribers))
+        return list(subscribers)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and backpressure counters for health checks."""
+        subscribers = self._all_subscribers()
+        return {
+            "pending": self._queue.qsize(),
+            "subscribers": len(subscribers),
+            "dropped": sum(subscriber.dropped for subscriber in subscribers)
+        }
     
     async def _process_actions(self):
         """Internal processing loop that distributes actions to subscribers."""
         while self._running:
             try:
-                action = await self._queue.get()
-                
-                # Distribute to all subscribers
-                for subscriber in self._subscribers[:]:  # Copy list to avoid modification during iteration
-                    try:
-                        subscriber.put_nowait(action)
-                    except asyncio.QueueFull:
-                        # Remove subscriber if their queue is full
-                        self._subscribers.remove(subscriber)
-                        print("⚠️ Removed unresponsive subscriber")
+                action, action_json = await self._queue.get()
+                try:
+                    droppable = action in _DROPPABLE_ACTIONS
+                    
+                    # Distribute to catch-all subscribers and those registered for this type
+                    # (copy lists to avoid modification during iteration)
+                    typed_subscribers = self._subscribers_by_type.get(action)
+                    subscribers = self._subscribers + typed_subscribers if typed_subscribers else self._subscribers[:]
+                    
+                    for subscriber in subscribers:
+                        subscriber.offer(action_json, droppable)
+                finally:
+                    self._queue.task_done()
                         
             except Exception as e:
                 print(f"❌ Error in command bus processing: {e}")
 
 
+# Maximum characters of free text (user input, TTS text) copied into payloads
+PREVIEW_LENGTH = 100
+
+
 # Global command bus instance
 _command_bus: Optional[CommandBus] = None
 
@@ -141,23 +248,102 @@ def emit_action(action: str, data: Dict[str, Any], source: str = None) -> str:
     # For sync compatibility, agents should use async emit directly
     # This is a fallback that may not work in all contexts
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # We're in an async context - cannot use run_until_complete
-            # Create a task instead of blocking
-            task = asyncio.create_task(_async_emit_action(action, data, source))
-            return f"async_task_{id(task)}"
-        else:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
             # Not in async context, create new event loop
             async def _emit():
                 bus = await get_command_bus()
                 return bus.emit(action, data, source)
             return asyncio.run(_emit())
+        
+        # We're in an async context - cannot use run_until_complete
+        # Create a task instead of blocking
+        task = asyncio.create_task(_async_emit_action(action, data, source))
+        return f"async_task_{id(task)}"
     except Exception as e:
         print(f"❌ Error emitting action: {e}")
         return ""
 
 
+async def get_action_batch(subscriber_queue: asyncio.Queue, max_batch: int = ACTION_BATCH_SIZE) -> List[str]:
+    """
+    Wait for the next action, then drain whatever else is already queued.
+    
+    Args:
+        subscriber_queue: Queue returned by CommandBus.subscribe()
+        max_batch: Maximum number of actions to return
+        
+    Returns:
+        List of serialized actions in emission order (never empty)
+    """
+    batch = [await subscriber_queue.get()]
+    while len(batch) < max_batch:
+        try:
+            batch.append(subscriber_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+def truncate_text(text: str, limit: int = PREVIEW_LENGTH) -> str:
+    """
+    Shorten free text for inclusion in an action payload.
+    
+    Args:
+        text: Text to shorten
+        limit: Maximum number of characters to keep
+        
+    Returns:
+        The original text, or its first `limit` characters followed by "..."
+    """
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def configure_event_loop() -> str:
+    """
+    Select the event loop policy for this process: the Proactor loop on Windows,
+    uvloop elsewhere when it is installed.
+    Must be called before asyncio.run(); has no effect on a running loop.
+    
+    Returns:
+        Name of the loop selected ("proactor", "uvloop" or "asyncio")
+    """
+    if sys.platform.startswith('win'):
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        return "proactor"
+    
+    try:
+        import uvloop
+    except ImportError:
+        return "asyncio"
+    
+    # Faster libuv-based loop for agent fan-out and WebSocket streaming
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return "uvloop"
+
+
+def install_eager_task_factory() -> bool:
+    """
+    Make new tasks on the running loop start eagerly (Python 3.12+): a task runs
+    synchronously until its first suspension, so work that finishes without real
+    I/O (cache hits, early errors) completes without a loop round-trip.
+    Process-wide, so call it once at startup from inside the loop; a custom task
+    factory that is already installed is left alone.
+    
+    Returns:
+        True if the eager task factory is in use afterwards
+    """
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is None:
+        return False
+    
+    loop = asyncio.get_running_loop()
+    if loop.get_task_factory() is None:
+        loop.set_task_factory(eager_task_factory)
+    return loop.get_task_factory() is eager_task_factory
+
+
 async def _async_emit_action(action: str, data: Dict[str, Any], source: str = None) -> str:
     """Helper for async emission."""
     try:
@@ -179,4 +365,8 @@ class ActionTypes:
     TOOL_COMPLETE = "tool_complete"
     ERROR = "error"
     AUDIO_START = "audio_start"
-    AUDIO_COMPLETE = "audio_complete"
\ No newline at end of file
+    AUDIO_COMPLETE = "audio_complete"
+
+
+# Actions that may be shed when a subscriber falls behind; newer updates supersede them
+_DROPPABLE_ACTIONS = frozenset({ActionTypes.UPDATE_STATUS, ActionTypes.SHOW_PROGRESS})
@@ -27,6 +27,12 @@ GENERATION_CONFIG = {
     "max_output_tokens": 2048,
 }
 
+# Concurrency Configuration
+MAX_INFLIGHT_LLM = 1  # Workflow runs in flight at once; 1 because runs share one PlannerAgent's history
+
+# Logging Configuration
+LOG_SAMPLE_INTERVAL = 100  # Repeated client errors (e.g. invalid JSON) are logged once per this many
+
 # TTS Configuration
 TTS_VOICE = "Kore"  # Available voices: Kore, Puck, Zephyr, Aoede, etc.
 TTS_CONFIG = {
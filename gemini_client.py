@@ -10,7 +10,7 @@ from google import genai as google_genai
 from google.genai import types
 from typing import List, Dict, Any, Tuple, Optional
 from config import GEMINI_API_KEY, MODEL_NAME, TTS_MODEL_NAME, GENERATION_CONFIG, TTS_CONFIG
-from tools import TOOLS_SPEC, execute_function
+from tools import TOOLS_SPEC, execute_function, execute_function_async
 
 
 class GeminiClient:
@@ -23,6 +23,33 @@ class GeminiClient:
         self.genai_client = google_genai.Client(api_key=GEMINI_API_KEY)
         self.chat = None
         self.function_call_schema = self._create_function_call_schema()
+        # The prompt prefix and generation configs never change, so build them once
+        self.system_context = self._create_system_context()
+        self.structured_generation_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=self.function_call_schema,
+            **GENERATION_CONFIG
+        )
+        self.text_generation_config = genai.GenerationConfig(**GENERATION_CONFIG)
+    
+    def _create_system_context(self) -> str:
+        """Create the system prompt describing the available functions."""
+        function_descriptions = []
+        for tool in TOOLS_SPEC:
+            if tool["type"] == "function":
+                func = tool["function"]
+                function_descriptions.append(f"- {func['name']}: {func['description']}")
+        
+        return f"""You are a helpful AI assistant.
+
+Available functions:
+{chr(10).join(function_descriptions)}
+
+Instructions:
+- ALWAYS provide a response in the "response" field
+- If the user's question requires external data (like weather), set needs_function_call to true and specify the function call
+- If you can answer directly (like jokes, general questions), set needs_function_call to false
+- Be helpful and conversational in your responses"""
     
     def _create_function_call_schema(self) -> Dict[str, Any]:
         """Create structured output schema for function calls."""
@@ -99,35 +126,12 @@ class GeminiClient:
             Tuple of (response_text, function_name, function_args)
         """
         try:
-            # Create system prompt with available functions info
-            available_functions = [tool["function"]["name"] for tool in TOOLS_SPEC if tool["type"] == "function"]
-            function_descriptions = []
-            for tool in TOOLS_SPEC:
-                if tool["type"] == "function":
-                    func = tool["function"]
-                    function_descriptions.append(f"- {func['name']}: {func['description']}")
-            
-            system_context = f"""You are a helpful AI assistant.
-
-Available functions:
-{chr(10).join(function_descriptions)}
-
-Instructions:
-- ALWAYS provide a response in the "response" field
-- If the user's question requires external data (like weather), set needs_function_call to true and specify the function call
-- If you can answer directly (like jokes, general questions), set needs_function_call to false
-- Be helpful and conversational in your responses"""
-            
-            full_prompt = f"{system_context}\n\nUser: {message}"
+            full_prompt = f"{self.system_context}\n\nUser: {message}"
             
             # Use structured output with schema
             response = self.model.generate_content(
                 full_prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
-                    response_schema=self.function_call_schema,
-                    **GENERATION_CONFIG
-                )
+                generation_config=self.structured_generation_config
             )
             
             # Parse the structured JSON response
@@ -169,6 +173,20 @@ Instructions:
         args_dict = json.loads(function_args or "{}")
         return execute_function(function_name, **args_dict)
     
+    async def execute_tool_call_async(self, function_name: str, function_args: str) -> Any:
+        """
+        Execute a tool call without blocking the event loop.
+        
+        Args:
+            function_name: Name of the function to call
+            function_args: JSON string of function arguments
+            
+        Returns:
+            Result of the function execution
+        """
+        args_dict = json.loads(function_args or "{}")
+        return await execute_function_async(function_name, **args_dict)
+    
     def send_tool_result(self, function_name: str, function_args: str, tool_result: Any) -> str:
         """
         Generate final response based on tool result.
@@ -194,7 +212,7 @@ Please provide a helpful response to the user based on this information. Be natu
             # Generate response without structured output (just normal text)
             response = self.model.generate_content(
                 prompt,
-                generation_config=genai.GenerationConfig(**GENERATION_CONFIG)
+                generation_config=self.text_generation_config
             )
             
             return response.text.strip()
@@ -250,4 +268,16 @@ Please provide a helpful response to the user based on this information. Be natu
             
         except Exception as e:
             print(f"❌ Error generating audio: {e}")
-            return None 
\ No newline at end of file
+            return None
+
+
+# Shared client instance so every agent reuses one set of API connections
+_gemini_client: Optional[GeminiClient] = None
+
+
+def get_gemini_client() -> GeminiClient:
+    """Get the shared Gemini client, creating it on first use."""
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = GeminiClient()
+    return _gemini_client
@@ -10,8 +10,30 @@ import argparse
 from typing import Dict, Any, Optional
 from workflow import create_default_workflow, TaskRouter
 from websocket_server import start_websocket_streaming
-from bus import get_command_bus, ActionTypes
+from bus import get_command_bus, configure_event_loop, install_eager_task_factory, ActionTypes, truncate_text
 from agents import PlannerAgent, WeatherAgent, CalendarAgent
+from config import MAX_INFLIGHT_LLM
+
+
+_HELP_TEXT = """
+📚 MultiModal Assistant Help:
+   💬 Natural conversation:
+      • 'What's the weather in Tokyo?'
+      • 'Tell me a joke about programming'
+      • 'What's on my schedule today?'
+   🤖 Agent-specific queries:
+      • Weather: temperature, forecast, conditions
+      • Calendar: schedule, meetings, events
+   ⚙️ System commands:
+      • 'agents' - List agents
+      • 'status' - System status
+      • 'quit' - Exit"""
+
+# Inputs that end the interactive session
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
+# Upper bound on waiting for the command bus to drain between demo scenarios
+DEMO_IDLE_TIMEOUT = 2.0
 
 
 class MultiAgentAssistant:
@@ -25,6 +47,9 @@ class MultiAgentAssistant:
         self.task_router = TaskRouter(self.workflow.agents)
         self.command_bus = None
         self.websocket_server_started = False
+        # Bound concurrent LLM work and share results of identical in-flight queries
+        self._llm_gate = asyncio.Semaphore(MAX_INFLIGHT_LLM)
+        self._inflight: Dict[str, asyncio.Task] = {}
         
     async def initialize(self):
         """Initialize the assistant systems."""
@@ -62,23 +87,47 @@ class MultiAgentAssistant:
         Returns:
             Processing result
         """
+        # Coalesce duplicate queries: await the run already in flight
+        pending = self._inflight.get(user_input)
+        if pending is None:
+            pending = asyncio.ensure_future(self._run_input(user_input))
+            self._inflight[user_input] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(user_input, None))
+        
+        return await asyncio.shield(pending)
+    
+    async def _run_input(self, user_input: str) -> Dict[str, Any]:
+        """
+        Run user input through the workflow, bounded by the LLM concurrency gate.
+        
+        Args:
+            user_input: User's input text
+            
+        Returns:
+            Processing result
+        """
+        update_status = ActionTypes.UPDATE_STATUS
+        emit = None
+        
         try:
             # Initialize command bus if needed
             if self.command_bus is None:
                 self.command_bus = await get_command_bus()
+            emit = self.command_bus.emit
             
             # Emit conversation start
-            self.command_bus.emit(ActionTypes.UPDATE_STATUS, {
+            emit(update_status, {
                 "conversation": "started",
-                "input": user_input[:100] + "..." if len(user_input) > 100 else user_input
+                "input": truncate_text(user_input)
             })
             
             # Route to appropriate workflow
             # For now, always use star topology with planner
-            result = await self.workflow(user_input)
+            async with self._llm_gate:
+                result = await self.workflow(user_input)
             
             # Emit conversation complete
-            self.command_bus.emit(ActionTypes.UPDATE_STATUS, {
+            emit(update_status, {
                 "conversation": "completed",
                 "success": "error" not in result
             })
@@ -90,8 +139,8 @@ class MultiAgentAssistant:
             print(f"\n❌ {error_msg}")
             
             # Try to emit error if command bus is available
-            if self.command_bus:
-                self.command_bus.emit(ActionTypes.ERROR, {
+            if emit is not None:
+                emit(ActionTypes.ERROR, {
                     "conversation": "failed",
                     "error": error_msg
                 })
@@ -113,19 +162,21 @@ class MultiAgentAssistant:
                 if not user_input:
                     continue
                     
-                if user_input.lower() in ['quit', 'exit', 'bye']:
+                command = user_input.lower()
+                
+                if command in _EXIT_COMMANDS:
                     print("\n👋 Goodbye!")
                     break
                     
-                elif user_input.lower() == 'agents':
+                elif command == 'agents':
                     self._show_agents_status()
                     continue
                     
-                elif user_input.lower() == 'status':
+                elif command == 'status':
                     self._show_system_status()
                     continue
                     
-                elif user_input.lower() == 'help':
+                elif command == 'help':
                     self._show_help()
                     continue
                 
@@ -165,18 +216,7 @@ class MultiAgentAssistant:
     
     def _show_help(self):
         """Show help information."""
-        print("\n📚 MultiModal Assistant Help:")
-        print("   💬 Natural conversation:")
-        print("      • 'What's the weather in Tokyo?'")
-        print("      • 'Tell me a joke about programming'")
-        print("      • 'What's on my schedule today?'")
-        print("   🤖 Agent-specific queries:")
-        print("      • Weather: temperature, forecast, conditions")
-        print("      • Calendar: schedule, meetings, events")
-        print("   ⚙️ System commands:")
-        print("      • 'agents' - List agents")
-        print("      • 'status' - System status")
-        print("      • 'quit' - Exit")
+        print(_HELP_TEXT)
 
 
 async def run_single_query(query: str):
@@ -231,10 +271,12 @@ async def run_demo_mode():
     ]
     
     for i, scenario in enumerate(demo_scenarios, 1):
-        print(f"\n🧪 Demo {i}/4: {scenario['name']}")
-        print(f"📝 {scenario['description']}")
-        print(f"🗣️  Query: '{scenario['query']}'")
-        print("─" * 50)
+        print("\n".join([
+            f"\n🧪 Demo {i}/{len(demo_scenarios)}: {scenario['name']}",
+            f"📝 {scenario['description']}",
+            f"🗣️  Query: '{scenario['query']}'",
+            "─" * 50
+        ]), flush=True)
         
         try:
             result = await assistant.process_input(scenario['query'])
@@ -244,8 +286,8 @@ async def run_demo_mode():
             else:
                 print("✅ Demo scenario completed successfully")
                 
-            # Wait between scenarios to avoid overwhelming output
-            await asyncio.sleep(2)
+            # Let this scenario's events reach subscribers before starting the next
+            await assistant.command_bus.wait_until_idle(timeout=DEMO_IDLE_TIMEOUT)
             
         except Exception as e:
             print(f"❌ Demo scenario failed: {e}")
@@ -337,6 +379,9 @@ async def main():
         import logging
         logging.basicConfig(level=logging.INFO)
     
+    # Start tasks eagerly for the whole process; set once here rather than by library code
+    install_eager_task_factory()
+    
     try:
         if args.demo:
             # Run multi-agent coordination demo
@@ -365,8 +410,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Handle Windows event loop policy
-    if sys.platform.startswith('win'):
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-    
+    # Proactor loop on Windows, uvloop elsewhere when available
+    configure_event_loop()
     asyncio.run(main())
\ No newline at end of file
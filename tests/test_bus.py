@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for command bus backpressure.
+Run from the repository root: python -m unittest discover tests
+"""
+
+import unittest
+
+from bus import CommandBus, SubscriberQueue, ActionTypes
+
+
+def _drain(queue: SubscriberQueue) -> list:
+    """Take every queued action without waiting."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+        queue.task_done()
+    return items
+
+
+class SubscriberQueueTest(unittest.TestCase):
+    """SubscriberQueue.offer under a full queue."""
+    
+    def test_full_queue_evicts_oldest_droppable_action(self):
+        queue = SubscriberQueue(maxsize=3)
+        queue.offer("speak-1")
+        queue.offer("status-1", droppable=True)
+        queue.offer("speak-2")
+        queue.offer("speak-3")
+        self.assertEqual(_drain(queue), ["speak-1", "speak-2", "speak-3"])
+        self.assertEqual(queue.dropped, 1)
+    
+    def test_droppable_overflow_discards_incoming_action(self):
+        queue = SubscriberQueue(maxsize=2)
+        queue.offer("speak-1")
+        queue.offer("speak-2")
+        queue.offer("status-1", droppable=True)
+        self.assertEqual(_drain(queue), ["speak-1", "speak-2"])
+        self.assertEqual(queue.dropped, 1)
+    
+    def test_undroppable_overflow_evicts_oldest_action(self):
+        queue = SubscriberQueue(maxsize=2)
+        for action in ("speak-1", "speak-2", "speak-3"):
+            queue.offer(action)
+        self.assertEqual(_drain(queue), ["speak-2", "speak-3"])
+        self.assertEqual(queue.dropped, 1)
+    
+    def test_evicted_actions_are_marked_done(self):
+        queue = SubscriberQueue(maxsize=1)
+        queue.offer("speak-1")
+        queue.offer("speak-2")
+        _drain(queue)
+        # join() would hang if an evicted action were never marked done
+        self.assertEqual(queue._unfinished_tasks, 0)
+
+
+class CommandBusBackpressureTest(unittest.IsolatedAsyncioTestCase):
+    """A subscriber that overflows stays subscribed."""
+    
+    async def test_overflowing_subscriber_keeps_receiving(self):
+        bus = CommandBus()
+        await bus.start()
+        try:
+            queue = bus.subscribe(maxsize=3, types=(ActionTypes.SPEAK,))
+            for i in range(5):
+                bus.emit(ActionTypes.SPEAK, {"text": f"overflow {i}"})
+            self.assertTrue(await bus.wait_until_idle(timeout=1))
+            self.assertEqual(len(_drain(queue)), 3)
+            self.assertEqual(queue.dropped, 2)
+            
+            bus.emit(ActionTypes.SPEAK, {"text": "after overflow"})
+            self.assertTrue(await bus.wait_until_idle(timeout=1))
+            self.assertIn("after overflow", queue.get_nowait())
+        finally:
+            await bus.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
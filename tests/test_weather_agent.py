@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for WeatherAgent's weather data cache.
+Run from the repository root: python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+from agents import WeatherAgent
+
+
+class WeatherCacheTest(unittest.IsolatedAsyncioTestCase):
+    """get_current_weather results are reused within the TTL."""
+    
+    def setUp(self):
+        self.agent = WeatherAgent(cache_ttl=30.0)
+        self.lookup = mock.AsyncMock(side_effect=lambda name, location: {
+            "location": location, "temperature_c": 23, "details": {"condition": "Sunny"}
+        })
+        patcher = mock.patch("agents.weather_agent.execute_function_async", self.lookup)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def test_repeated_location_is_a_cache_hit(self):
+        with mock.patch("agents.weather_agent.time.monotonic", return_value=100.0):
+            first = await self.agent._get_weather("Paris")
+            second = await self.agent._get_weather("Paris")
+        self.assertEqual(self.lookup.await_count, 1)
+        self.assertEqual(first, second)
+    
+    async def test_entry_expires_after_ttl(self):
+        with mock.patch("agents.weather_agent.time.monotonic", return_value=100.0):
+            await self.agent._get_weather("Paris")
+        with mock.patch("agents.weather_agent.time.monotonic", return_value=130.0):
+            await self.agent._get_weather("Paris")
+        self.assertEqual(self.lookup.await_count, 2)
+    
+    async def test_cached_data_is_not_shared_with_callers(self):
+        first = await self.agent._get_weather("Paris")
+        first["details"]["condition"] = "Changed"
+        second = await self.agent._get_weather("Paris")
+        self.assertEqual(second["details"]["condition"], "Sunny")
+    
+    async def test_errors_are_not_cached(self):
+        self.lookup.side_effect = lambda name, location: {"error": "unavailable"}
+        await self.agent._get_weather("Paris")
+        await self.agent._get_weather("Paris")
+        self.assertEqual(self.lookup.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for workflow task routing.
+Run from the repository root: python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+
+from workflow import TaskRouter, Workflow
+
+
+class PlainAgent:
+    """ADK-style agent: only name and run(), no BaseAgent attributes."""
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    async def run(self, task, context=None):
+        return {"formatted_response": f"{self.name}: {task}"}
+
+
+class TaskRouterTest(unittest.TestCase):
+    """Keyword routing used by the parallel topology."""
+    
+    def setUp(self):
+        # The router only looks at agent names
+        self.router = TaskRouter(dict.fromkeys(["PlannerAgent", "WeatherAgent", "CalendarAgent"]))
+    
+    def test_single_category_runs_its_specialist(self):
+        self.assertEqual(self.router.route_candidates("What's the weather in Paris?"), ["WeatherAgent"])
+        self.assertEqual(self.router.route_candidates("Show my schedule"), ["CalendarAgent"])
+    
+    def test_mixed_query_fans_out_to_every_agent(self):
+        candidates = self.router.route_candidates("What's the weather and my schedule today?")
+        self.assertEqual(candidates, ["PlannerAgent", "WeatherAgent", "CalendarAgent"])
+    
+    def test_general_query_fans_out_to_every_agent(self):
+        self.assertEqual(len(self.router.route_candidates("Tell me a joke")), 3)
+    
+    def test_route_task_prefers_weather(self):
+        self.assertEqual(self.router.route_task("weather and my schedule"), "WeatherAgent")
+
+
+
+class PlainAgentWorkflowTest(unittest.IsolatedAsyncioTestCase):
+    """Agents that only implement the Agent protocol."""
+    
+    def test_parallel_workflow_accepts_plain_agents(self):
+        workflow = Workflow([PlainAgent("a"), PlainAgent("b")], "parallel")
+        self.assertEqual(workflow.list_agents(), ["a", "b"])
+    
+    async def test_chain_workflow_runs_plain_agents_with_default_hints(self):
+        workflow = Workflow([PlainAgent("a"), PlainAgent("b")], "chain")
+        result = await workflow._execute_chain_topology("task")
+        # b consumes a's formatted response by default
+        self.assertEqual(result["formatted_response"], "b: a: task")
+
+
+
+class CountingAgent(PlainAgent):
+    """Records the most runs that were in progress at once."""
+    
+    def __init__(self, name: str, max_concurrency=None):
+        super().__init__(name)
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.peak = 0
+    
+    async def run(self, task, context=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return {}
+
+
+class AgentConcurrencyTest(unittest.IsolatedAsyncioTestCase):
+    """Per-agent limits on concurrent runs."""
+    
+    async def _run_concurrently(self, agent: CountingAgent, runs: int = 4) -> int:
+        workflow = Workflow([agent], "parallel", agent_concurrency=8)
+        await asyncio.gather(*(workflow._run_agent(agent, "task") for _ in range(runs)))
+        return agent.peak
+    
+    async def test_agent_max_concurrency_is_honoured(self):
+        self.assertEqual(await self._run_concurrently(CountingAgent("serial", max_concurrency=1)), 1)
+    
+    async def test_workflow_limit_applies_by_default(self):
+        self.assertEqual(await self._run_concurrently(CountingAgent("shared")), 4)
+
+
+
+class ScriptedAgent(PlainAgent):
+    """Chain agent with declared hints that logs when it starts and finishes."""
+    
+    def __init__(self, name: str, log: list, consumes=frozenset(), produces=frozenset(),
+                 result=None, delay: float = 0.0, error: Exception = None):
+        super().__init__(name)
+        self.consumes = consumes
+        self.produces = produces
+        self.log = log
+        self.result = result or {}
+        self.delay = delay
+        self.error = error
+        self.context = None
+        self.cancelled = False
+    
+    async def run(self, task, context=None):
+        self.log.append(f"{self.name} start")
+        self.context = dict(context)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        self.log.append(f"{self.name} end")
+        return self.result
+
+
+class ChainTopologyTest(unittest.IsolatedAsyncioTestCase):
+    """Dependency scheduling and context layering in chain workflows."""
+    
+    async def test_consumers_wait_for_producers_and_see_their_results(self):
+        log = []
+        source = ScriptedAgent("source", log, produces=frozenset({"location"}),
+                               result={"location": "Paris"}, delay=0.02)
+        independent = ScriptedAgent("independent", log, result={"independent": True})
+        consumer = ScriptedAgent("consumer", log, consumes=frozenset({"location"}))
+        workflow = Workflow([source, independent, consumer], "chain")
+        caller_context = {"orig": 1}
+        
+        result = await workflow._execute_chain_topology("task", caller_context)
+        
+        self.assertLess(log.index("independent start"), log.index("source end"))
+        self.assertLess(log.index("source end"), log.index("consumer start"))
+        self.assertEqual(consumer.context, {"orig": 1, "location": "Paris", "independent": True})
+        self.assertEqual(independent.context, {"orig": 1})
+        self.assertEqual(result, {"orig": 1, "location": "Paris", "independent": True})
+        self.assertEqual(caller_context, {"orig": 1})
+    
+    async def test_failure_cancels_and_awaits_running_siblings(self):
+        log = []
+        failing = [ScriptedAgent(f"failing{i}", log, error=ValueError(f"boom {i}")) for i in range(2)]
+        slow = ScriptedAgent("slow", log, delay=1.0)
+        workflow = Workflow([*failing, slow], "chain")
+        
+        with self.assertRaises(ValueError):
+            await workflow._execute_chain_topology("task")
+        self.assertTrue(slow.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@
 Tools and function definitions for the multimodal assistant.
 """
 
+import asyncio
+import functools
 from typing import Dict, Any, List
 
 
@@ -66,4 +68,32 @@ def execute_function(function_name: str, **kwargs) -> Any:
     if function_name not in FUNCTION_REGISTRY:
         raise ValueError(f"Function '{function_name}' not found in registry")
     
-    return FUNCTION_REGISTRY[function_name](**kwargs) 
\ No newline at end of file
+    return FUNCTION_REGISTRY[function_name](**kwargs)
+
+
+async def execute_function_async(function_name: str, **kwargs) -> Any:
+    """
+    Execute a function from the registry without blocking the event loop.
+    
+    Coroutine functions are awaited directly; plain functions (which may do
+    blocking I/O) run in the default thread pool executor.
+    
+    Args:
+        function_name: Name of the function to execute
+        **kwargs: Arguments to pass to the function
+        
+    Returns:
+        Result of the function execution
+        
+    Raises:
+        ValueError: If function is not found in registry
+    """
+    if function_name not in FUNCTION_REGISTRY:
+        raise ValueError(f"Function '{function_name}' not found in registry")
+    
+    func = FUNCTION_REGISTRY[function_name]
+    if asyncio.iscoroutinefunction(func):
+        return await func(**kwargs)
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, **kwargs))
@@ -8,14 +8,46 @@ import asyncio
 import websockets
 import json
 import logging
+import os
+import orjson
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Optional, AsyncGenerator
 import wave
 import io
-from bus import get_command_bus, ActionTypes
+from bus import get_command_bus, configure_event_loop, ActionTypes, truncate_text
+from config import LOG_SAMPLE_INTERVAL
 
 # Note: Piper TTS integration will require actual piper-tts installation
 # For now, we'll create the infrastructure and use a mock implementation
 
+# Sentence boundaries used to stream synthesis one sentence at a time; mapping
+# every terminator to "." lets str.split do the scan without the regex engine
+_SENTENCE_END_TABLE = str.maketrans("!?", "..")
+
+# Control message templates; only the text field needs JSON escaping. Every
+# message of a synthesis carries its id, and each binary sentence message is
+# preceded by an audio header naming the synthesis it belongs to
+_SYNTHESIS_START_TEMPLATE = '{{"type":"synthesis_start","id":"{id}","text":{text}}}'
+_SYNTHESIS_AUDIO_TEMPLATE = '{{"type":"synthesis_audio","id":"{id}"}}'
+_SYNTHESIS_COMPLETE_TEMPLATE = '{{"type":"synthesis_complete","id":"{id}","text":{text}}}'
+_SYNTHESIS_REJECTED_TEMPLATE = '{{"type":"synthesis_rejected","reason":"queue_full","id":"{id}"}}'
+
+# Filename suffix for int8-quantized Piper models, e.g. en_US-amy-low.int8.onnx
+INT8_SUFFIX = ".int8"
+
+
+@dataclass
+class SynthesisRequest:
+    """A client 'synthesize' request waiting for a synthesis worker."""
+    __slots__ = ("id", "text", "websocket", "timestamp")
+    id: str
+    text: str
+    websocket: object
+    timestamp: float
+
 
 class PiperTTSWorker:
     """
@@ -29,12 +61,23 @@ class PiperTTSWorker:
         self.port = port
         self.model = None
         self.clients = set()
+        self.client_locks = {}  # WebSocket -> Lock keeping that client's syntheses in request order
         self.sentence_buffer = ""
         self.command_bus = None
+        # Only the bus listener assembles whole sentences, one at a time, so one buffer suffices
+        self.buffer_pool = PcmBufferPool(size=1)
+        self.invalid_messages = 0
+        self.processing_queue: asyncio.Queue = asyncio.Queue(maxsize=TTSConfig.MAX_QUEUED_SYNTHESES)
+        self._synthesis_ids = itertools.count(1)
+        self._now = None  # Bound loop.time, set in start()
+        self._send_slots = asyncio.Semaphore(TTSConfig.MAX_CONCURRENT_SENDS)
+        self.synthesis_tasks = []
         
     async def start(self):
         """Start the TTS worker server."""
         try:
+            self._now = asyncio.get_running_loop().time
+            
             # Initialize Piper model (mock for now)
             await self._load_model()
             
@@ -42,16 +85,24 @@ class PiperTTSWorker:
             self.command_bus = await get_command_bus()
             
             # Start WebSocket server
+            # PCM audio does not compress; skip permessage-deflate entirely, and
+            # let a whole batched sentence sit in the write buffer before draining
             server = await websockets.serve(
                 self.handle_client,
                 self.host,
-                self.port
+                self.port,
+                compression=None,
+                write_limit=TTSConfig.WRITE_LIMIT
             )
             
             print(f"🎵 TTS Worker started on ws://{self.host}:{self.port}")
             
-            # Start command bus listener
+            # Start command bus listener and client synthesis workers
             asyncio.create_task(self._listen_for_speech_requests())
+            self.synthesis_tasks = [
+                asyncio.create_task(self._synthesis_worker())
+                for _ in range(TTSConfig.SYNTHESIS_WORKERS)
+            ]
             
             return server
             
@@ -62,16 +113,16 @@ class PiperTTSWorker:
     async def _load_model(self):
         """Load the Piper TTS model."""
         try:
-            # Mock implementation - in production, use actual Piper
             print(f"📦 Loading Piper model: {self.model_path}")
             
-            # Actual Piper integration would look like:
-            # import piper
-            # self.model = piper.load(self.model_path)
+            # Loading reads and initializes the ONNX model; keep it off the event loop
+            loop = asyncio.get_running_loop()
+            self.model = await loop.run_in_executor(None, PiperModel, self.model_path)
+            print("✅ Piper model loaded successfully")
             
-            # For now, use mock
+        except ImportError:
+            print("⚠️ piper-tts not installed, using mock TTS model")
             self.model = MockPiperModel()
-            print("✅ Piper model loaded successfully")
             
         except Exception as e:
             print(f"❌ Error loading Piper model: {e}")
@@ -81,6 +132,7 @@ class PiperTTSWorker:
     async def handle_client(self, websocket, path):
         """Handle WebSocket client connections."""
         self.clients.add(websocket)
+        self.client_locks[websocket] = asyncio.Lock()
         client_addr = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
         print(f"🔌 TTS client connected: {client_addr}")
         
@@ -91,42 +143,88 @@ class PiperTTSWorker:
             print(f"🔌 TTS client disconnected: {client_addr}")
         finally:
             self.clients.discard(websocket)
+            self.client_locks.pop(websocket, None)
     
     async def _process_client_message(self, websocket, message: str):
         """Process incoming messages from TTS clients."""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             action = data.get("action")
             
             if action == "synthesize":
-                text = data.get("text", "")
-                await self._synthesize_and_stream(text, websocket)
+                # Queue rather than synthesize inline so this client's next
+                # message (e.g. "stop") is still read while audio streams
+                await self._queue_synthesis(data.get("text", ""), websocket)
                 
             elif action == "stop":
                 # Stop current synthesis
                 pass
                 
-        except json.JSONDecodeError:
-            print(f"⚠️ Invalid JSON from TTS client: {message}")
+        except orjson.JSONDecodeError:
+            # Sample the log so a misbehaving client cannot flood it
+            self.invalid_messages += 1
+            if self.invalid_messages % LOG_SAMPLE_INTERVAL == 1:
+                print(f"⚠️ Invalid JSON from TTS client ({self.invalid_messages} total): {truncate_text(str(message))}")
         except Exception as e:
             print(f"❌ Error processing TTS client message: {e}")
     
+    async def _queue_synthesis(self, text: str, websocket):
+        """
+        Queue a client synthesis request for the synthesis workers.
+        
+        Args:
+            text: Text to synthesize
+            websocket: WebSocket to stream the audio to
+        """
+        request = SynthesisRequest(
+            f"syn_{next(self._synthesis_ids)}",
+            text,
+            websocket,
+            self._now()
+        )
+        
+        # Reject instead of waiting so a flooding client cannot grow memory or stall its reader
+        try:
+            self.processing_queue.put_nowait(request)
+        except asyncio.QueueFull:
+            await websocket.send(_SYNTHESIS_REJECTED_TEMPLATE.format(id=request.id))
+    
+    async def _synthesis_worker(self):
+        """Synthesize queued client requests, one at a time per worker."""
+        while True:
+            request = await self.processing_queue.get()
+            try:
+                # Skip work for clients that disconnected while queued
+                lock = self.client_locks.get(request.websocket)
+                if lock is not None and request.websocket in self.clients:
+                    # Workers share the queue, so serialize per client: a client's
+                    # requests stream one after another, in the order they arrived
+                    async with lock:
+                        await self._synthesize_and_stream(request.text, request.websocket, request.id)
+            except Exception as e:
+                print(f"❌ Error in TTS synthesis worker: {e}")
+            finally:
+                self.processing_queue.task_done()
+    
     async def _listen_for_speech_requests(self):
         """Listen for speech requests from the command bus."""
         if not self.command_bus:
             return
             
-        subscriber_queue = self.command_bus.subscribe()
+        # The bus only delivers speech requests, so no other action wakes this task
+        subscriber_queue = self.command_bus.subscribe(types=(ActionTypes.SPEAK,))
         
         try:
             while True:
                 action_json = await subscriber_queue.get()
-                action_data = json.loads(action_json)
                 
-                if action_data.get("action") == ActionTypes.SPEAK:
-                    text = action_data.get("data", {}).get("text", "")
-                    if text:
-                        await self._synthesize_and_broadcast(text)
+                action_data = orjson.loads(action_json)
+                text = action_data.get("data", {}).get("text", "")
+                if text:
+                    await self._synthesize_and_broadcast(text)
+                
+                # Give client handlers a turn between back-to-back speech requests
+                await asyncio.sleep(0)
                         
         except Exception as e:
             print(f"❌ Error in TTS command bus listener: {e}")
@@ -134,58 +232,188 @@ class PiperTTSWorker:
             self.command_bus.unsubscribe(subscriber_queue)
     
     async def _synthesize_and_broadcast(self, text: str):
-        """Synthesize text and broadcast to all connected clients."""
+        """
+        Synthesize text once and broadcast the same audio to all connected clients.
+        
+        Args:
+            text: Text to synthesize
+        """
         if not self.clients:
             return
+        
+        synthesis_id = f"syn_{next(self._synthesis_ids)}"
+        audio_header = _SYNTHESIS_AUDIO_TEMPLATE.format(id=synthesis_id)
+        try:
+            await self._broadcast(_SYNTHESIS_START_TEMPLATE.format(
+                id=synthesis_id,
+                text=orjson.dumps(truncate_text(text)).decode()
+            ))
+            
+            for sentence in self._split_into_sentences(text):
+                # Run the model once per sentence into a pooled buffer, then fan it out
+                buffer, chunks = await self._synthesize_into_buffer(sentence)
+                try:
+                    if not self.clients:
+                        return
+                    # One fragmented message per sentence, as in _synthesize_and_stream
+                    await asyncio.gather(
+                        *[self._send_chunks(client, [audio_header, chunks]) for client in list(self.clients)],
+                        return_exceptions=True
+                    )
+                finally:
+                    # Drop the views so the buffer can be resized on its next use
+                    for chunk in chunks:
+                        chunk.release()
+                    self.buffer_pool.release(buffer)
+            
+            await self._broadcast(_SYNTHESIS_COMPLETE_TEMPLATE.format(
+                id=synthesis_id,
+                text=orjson.dumps(text).decode()
+            ))
             
-        clients_copy = list(self.clients)
+        except Exception as e:
+            print(f"❌ Error in TTS broadcast: {e}")
+    
+    async def _synthesize_into_buffer(self, sentence: str):
+        """
+        Synthesize a sentence into a buffer borrowed from the pool.
+        
+        Args:
+            sentence: Sentence to synthesize
+            
+        Returns:
+            Tuple of (buffer, chunks) where chunks are memoryview slices of the
+            buffer, each holding up to TTSConfig.SEND_BATCH_MS of audio; the
+            caller must release the buffer once the chunks are sent
+        """
+        buffer = self.buffer_pool.acquire()
+        size = 0
+        async for audio_chunk in self._synthesize_sentence(sentence):
+            end = size + len(audio_chunk)
+            if end > len(buffer):
+                buffer.extend(bytes(end - len(buffer)))
+            buffer[size:end] = audio_chunk
+            size = end
+        
+        # The whole sentence is ready, so frame it by size alone
+        batch_bytes = self._send_batch_bytes()
+        view = memoryview(buffer)
+        chunks = [view[offset:min(offset + batch_bytes, size)] for offset in range(0, size, batch_bytes)]
+        return buffer, chunks
+    
+    async def _broadcast(self, message: str):
+        """Send one message to every connected client."""
         await asyncio.gather(
-            *[self._synthesize_and_stream(text, client) for client in clients_copy],
+            *[self._send_chunks(client, [message]) for client in list(self.clients)],
             return_exceptions=True
         )
     
-    async def _synthesize_and_stream(self, text: str, websocket):
+    async def _send_chunks(self, websocket, chunks: list):
+        """
+        Send pre-synthesized chunks to a single client, dropping it on disconnect.
+        The chunks go out together, never interleaved with the client's own syntheses.
+        
+        Args:
+            websocket: WebSocket to stream to
+            chunks: Messages to send in order: JSON text, PCM bytes, or a list
+                of PCM buffers sent as the fragments of a single message
+        """
+        lock = self.client_locks.get(websocket)
+        if lock is None:
+            # Disconnected since the broadcast started
+            return
+        
+        try:
+            # Take the client's lock first so a broadcast waiting out the client's
+            # own synthesis does not hold a send slot; then cap in-flight broadcast
+            # sends so a large audience cannot pile up write buffers at once
+            async with lock:
+                async with self._send_slots:
+                    for chunk in chunks:
+                        await websocket.send(chunk)
+        except websockets.exceptions.ConnectionClosed:
+            self.clients.discard(websocket)
+    
+    async def _synthesize_and_stream(self, text: str, websocket, synthesis_id: str):
         """
         Synthesize text to speech and stream PCM chunks.
         
         Args:
             text: Text to synthesize
             websocket: WebSocket to stream to
+            synthesis_id: Request id sent with every message of this synthesis
         """
+        audio_header = _SYNTHESIS_AUDIO_TEMPLATE.format(id=synthesis_id)
         try:
             # Send synthesis start notification
-            await websocket.send(json.dumps({
-                "type": "synthesis_start",
-                "text": text[:100] + "..." if len(text) > 100 else text
-            }))
+            await websocket.send(_SYNTHESIS_START_TEMPLATE.format(
+                id=synthesis_id,
+                text=orjson.dumps(truncate_text(text)).decode()
+            ))
             
             # Process text sentence by sentence for lower latency
             sentences = self._split_into_sentences(text)
             
             for sentence in sentences:
-                if sentence.strip():
-                    # Generate audio for this sentence
-                    async for audio_chunk in self._synthesize_sentence(sentence):
-                        # Send PCM audio chunk
-                        await websocket.send(audio_chunk)
+                # Send each sentence as one binary message, fragmented as audio
+                # batches are produced, so clients get one event per sentence
+                await websocket.send(audio_header)
+                await websocket.send(self._synthesize_batched(sentence))
             
             # Send completion notification
-            await websocket.send(json.dumps({
-                "type": "synthesis_complete",
-                "text": text
-            }))
+            await websocket.send(_SYNTHESIS_COMPLETE_TEMPLATE.format(
+                id=synthesis_id,
+                text=orjson.dumps(text).decode()
+            ))
             
         except websockets.exceptions.ConnectionClosed:
             self.clients.discard(websocket)
         except Exception as e:
             print(f"❌ Error in TTS synthesis: {e}")
     
+    def _send_batch_bytes(self) -> int:
+        """Number of PCM bytes in TTSConfig.SEND_BATCH_MS of audio from the loaded model."""
+        sample_rate = getattr(self.model, "sample_rate", TTSConfig.SAMPLE_RATE)
+        return sample_rate * TTSConfig.SAMPLE_WIDTH * TTSConfig.CHANNELS * TTSConfig.SEND_BATCH_MS // 1000
+    
+    async def _synthesize_batched(self, sentence: str) -> AsyncGenerator[bytes, None]:
+        """
+        Synthesize a sentence, coalescing adjacent chunks into larger PCM frames.
+        A frame is flushed once it holds TTSConfig.SEND_BATCH_MS of audio, once it
+        has been filling for that long, or at the end of the sentence.
+        
+        Args:
+            sentence: Sentence to synthesize
+            
+        Yields:
+            PCM audio batches as bytes
+        """
+        now = self._now
+        target_bytes = self._send_batch_bytes()
+        max_wait = TTSConfig.SEND_BATCH_MS / 1000
+        
+        batch = bytearray()
+        started = 0.0
+        async for audio_chunk in self._synthesize_sentence(sentence):
+            if not batch:
+                started = now()
+            batch += audio_chunk
+            if len(batch) >= target_bytes or now() - started >= max_wait:
+                yield bytes(batch)
+                batch.clear()
+        
+        if batch:
+            yield bytes(batch)
+    
     def _split_into_sentences(self, text: str) -> list:
         """Split text into sentences for streaming synthesis."""
-        import re
+        # Fast path: a single sentence (the common short-reply case) needs no scan
+        if "." not in text and "!" not in text and "?" not in text:
+            text = text.strip()
+            return [text] if text else []
+        
         # Simple sentence splitting - in production, use more sophisticated methods
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return [s for s in (part.strip() for part in text.translate(_SENTENCE_END_TABLE).split(".")) if s]
     
     async def _synthesize_sentence(self, sentence: str) -> AsyncGenerator[bytes, None]:
         """
@@ -202,11 +430,6 @@ class PiperTTSWorker:
             
         try:
             # Use Piper model to generate audio chunks
-            # This would be the actual Piper integration:
-            # for audio_chunk in self.model.stream(sentence):
-            #     yield audio_chunk
-            
-            # Mock implementation for now
             async for chunk in self.model.stream(sentence):
                 yield chunk
                 
@@ -214,12 +437,168 @@ class PiperTTSWorker:
             print(f"❌ Error synthesizing sentence '{sentence}': {e}")
 
 
+class PiperModel:
+    """
+    Piper TTS model adapter.
+    Piper inference is synchronous and CPU-bound, so it runs on a worker thread
+    and its chunks are handed back to the event loop as they are produced.
+    """
+    
+    def __init__(self, model_path: str, use_gpu: Optional[bool] = None, max_workers: int = 2):
+        from piper import PiperVoice
+        from piper.config import PiperConfig
+        import onnxruntime
+        
+        if use_gpu is None:
+            use_gpu = TTSConfig.USE_GPU
+        
+        # The voice config always sits next to the fp32 model
+        fp32_path, int8_path = _model_paths(model_path)
+        with open(f"{fp32_path}.json", "r", encoding="utf-8") as config_file:
+            config = PiperConfig.from_dict(json.load(config_file))
+        
+        # Build the session ourselves so GPU execution providers can be requested;
+        # onnxruntime falls back along the list to the CPU provider
+        self.providers = self._select_providers(use_gpu, onnxruntime.get_available_providers())
+        
+        # On CPU, prefer the int8 variant when one has been generated
+        wants_int8 = _is_int8_path(model_path) or (
+            TTSConfig.PREFER_INT8_ON_CPU and self.providers == ["CPUExecutionProvider"]
+        )
+        onnx_path = int8_path if wants_int8 and os.path.exists(int8_path) else fp32_path
+        
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.enable_cpu_mem_arena = True
+        session = onnxruntime.InferenceSession(
+            onnx_path,
+            sess_options=sess_options,
+            providers=self.providers
+        )
+        
+        self.voice = PiperVoice(config=config, session=session)
+        self.sample_rate = config.sample_rate
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="piper")
+        print(f"🎛️ Piper model {os.path.basename(onnx_path)} on {', '.join(session.get_providers())}")
+        
+    @staticmethod
+    def _select_providers(use_gpu: bool, available: list) -> list:
+        """Pick ONNX Runtime execution providers, fastest first, limited to those installed."""
+        if not use_gpu:
+            return ["CPUExecutionProvider"]
+        
+        providers = [
+            provider for provider in TTSConfig.GPU_PROVIDERS
+            if (provider[0] if isinstance(provider, tuple) else provider) in available
+        ]
+        return providers + ["CPUExecutionProvider"]
+        
+    def _produce(self, text: str, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, stop: threading.Event):
+        """Run synthesis on the worker thread, forwarding chunks to the loop."""
+        try:
+            for audio_chunk in self.voice.synthesize_stream_raw(text):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, audio_chunk)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+        
+    async def stream(self, text: str) -> AsyncGenerator[bytes, None]:
+        """Streaming synthesis without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        producer = loop.run_in_executor(self._executor, self._produce, text, loop, queue, stop)
+        
+        try:
+            while True:
+                audio_chunk = await queue.get()
+                if audio_chunk is None:
+                    break
+                if isinstance(audio_chunk, Exception):
+                    raise audio_chunk
+                yield audio_chunk
+        finally:
+            # Stop the worker early if the consumer went away mid-sentence
+            stop.set()
+            await producer
+
+
+def _is_int8_path(model_path: str) -> bool:
+    """Whether a model name or path refers to an int8-quantized variant."""
+    base = model_path[:-len(".onnx")] if model_path.endswith(".onnx") else model_path
+    return base.endswith(INT8_SUFFIX)
+
+
+def _model_paths(model_path: str):
+    """
+    Resolve a Piper model name or path to its fp32 and int8 ONNX files.
+    
+    Args:
+        model_path: Model name or path, with or without ".onnx" or the int8 suffix
+        
+    Returns:
+        Tuple of (fp32_path, int8_path)
+    """
+    base = model_path[:-len(".onnx")] if model_path.endswith(".onnx") else model_path
+    if base.endswith(INT8_SUFFIX):
+        base = base[:-len(INT8_SUFFIX)]
+    return f"{base}.onnx", f"{base}{INT8_SUFFIX}.onnx"
+
+
+def quantize_piper_model(model_path: str) -> str:
+    """
+    Write an int8 dynamically quantized copy of a Piper model next to the original.
+    
+    Args:
+        model_path: fp32 model name or path
+        
+    Returns:
+        Path of the quantized model
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    
+    fp32_path, int8_path = _model_paths(model_path)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"✅ Quantized {fp32_path} -> {int8_path}")
+    return int8_path
+
+
+class PcmBufferPool:
+    """
+    Small pool of reusable bytearrays for assembling synthesized PCM audio.
+    Buffers grow to fit the longest sentence seen and are then reused as-is;
+    size the pool to the number of sentences assembled at once.
+    """
+    
+    def __init__(self, size: int = 1, buffer_size: int = 64 * 1024):
+        self.size = size
+        self.buffer_size = buffer_size
+        self._free = [bytearray(buffer_size) for _ in range(size)]
+        
+    def acquire(self) -> bytearray:
+        """Borrow a buffer, allocating a new one if the pool is empty."""
+        if self._free:
+            return self._free.pop()
+        return bytearray(self.buffer_size)
+    
+    def release(self, buffer: bytearray):
+        """Return a buffer to the pool once nothing references its contents."""
+        if len(self._free) < self.size:
+            self._free.append(buffer)
+
+
 class MockPiperModel:
     """Mock Piper model for testing without actual Piper installation."""
     
     def __init__(self):
         self.sample_rate = 22050
         self.chunk_size = 1024  # ~46ms at 22kHz
+        # One full chunk of 16-bit silence, reused for every yielded chunk
+        self._silence = bytes(self.chunk_size * 2)
+        # Final partial chunks by sample count; silence is immutable, so sharing is safe
+        self._tail_cache = {}
         
     async def stream(self, text: str) -> AsyncGenerator[bytes, None]:
         """Mock streaming synthesis - generates silence."""
@@ -234,7 +613,12 @@ class MockPiperModel:
         for i in range(chunks_needed):
             # Generate chunk of silence (16-bit PCM)
             chunk_samples = min(self.chunk_size, total_samples - (i * self.chunk_size))
-            silence_chunk = b'\x00\x00' * chunk_samples  # 16-bit silence
+            if chunk_samples == self.chunk_size:
+                silence_chunk = self._silence
+            else:
+                silence_chunk = self._tail_cache.get(chunk_samples)
+                if silence_chunk is None:
+                    silence_chunk = self._tail_cache.setdefault(chunk_samples, bytes(chunk_samples * 2))
             
             # Simulate processing time (~40ms per chunk)
             await asyncio.sleep(0.04)
@@ -247,10 +631,23 @@ class TTSConfig:
     # Piper model configurations
     MODELS = {
         "fast": "en_US-amy-low",           # ~25MB, very fast
+        "fast-int8": "en_US-amy-low.int8",  # int8 quantized, fastest on CPU
         "medium": "en_US-libritts_r-medium",  # ~40MB, good quality
         "high": "en_US-libritts_r-high"    # ~100MB, best quality
     }
     
+    # Inference settings
+    USE_GPU = False  # Prefer GPU execution providers when onnxruntime-gpu is installed
+    PREFER_INT8_ON_CPU = True  # Use <model>.int8.onnx on CPU when it exists
+    GPU_PROVIDERS = [
+        ("TensorrtExecutionProvider", {
+            "trt_fp16_enable": True,
+            "trt_engine_cache_enable": True,
+            "trt_engine_cache_path": ".trt_cache"
+        }),
+        "CUDAExecutionProvider"
+    ]
+    
     # Audio settings
     SAMPLE_RATE = 22050
     CHANNELS = 1
@@ -258,6 +655,11 @@ class TTSConfig:
     
     # Streaming settings
     CHUNK_DURATION_MS = 50  # 50ms chunks for low latency
+    SEND_BATCH_MS = 200  # Coalesce PCM chunks into frames of up to this much audio
+    WRITE_LIMIT = 2 ** 20  # Per-connection write buffer high-water mark, in bytes
+    SYNTHESIS_WORKERS = 2  # Client synthesis requests processed concurrently
+    MAX_QUEUED_SYNTHESES = 128  # Pending client requests before new ones are rejected
+    MAX_CONCURRENT_SENDS = 32  # Clients written to at once when broadcasting
     SENTENCE_BUFFER_SIZE = 1000  # Max characters before forcing synthesis
 
 
@@ -286,4 +688,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    configure_event_loop()
     asyncio.run(main())
\ No newline at end of file
@@ -5,37 +5,68 @@ Provides real-time communication between agents and UI components.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
-from typing import Set, Dict, Any
+import orjson
+from typing import Set, Dict, Any, Optional
 import websockets
 from websockets.server import WebSocketServerProtocol
-from bus import get_command_bus, CommandBus
+from bus import get_command_bus, get_action_batch, truncate_text, configure_event_loop, CommandBus
+from config import LOG_SAMPLE_INTERVAL
+
+
+# Frames buffered per client before new frames are dropped for that client
+CLIENT_QUEUE_SIZE = 256
+
+# Welcome messages, prebuilt so connects only interpolate the per-client fields
+_WELCOME_TEMPLATE = (
+    '{{"action":"connection_established",'
+    '"data":{{"message":"Connected to MultiModal Assistant","client_id":"{client_id}"}},'
+    '"id":"welcome","timestamp":{timestamp}}}'
+)
+_WELCOME_MESSAGE = orjson.dumps({
+    "action": "connection_established",
+    "data": {"message": "Connected to MultiModal Assistant"},
+    "id": "welcome"
+}).decode()
+_PONG_TEMPLATE = '{{"action":"pong","data":{{"timestamp":{timestamp}}},"id":"pong"}}'
 
 
 class WebSocketActionStreamer:
     """WebSocket server that streams command bus actions to connected clients."""
     
-    def __init__(self, host: str = "localhost", port: int = 8765):
+    def __init__(self, host: str = "localhost", port: int = 8765, compression: Optional[str] = "deflate"):
         self.host = host
         self.port = port
+        # Batched JSON actions compress well; pass None to trade bandwidth for CPU and latency
+        self.compression = compression
         self.clients: Set[WebSocketServerProtocol] = set()
+        self.client_queues: Dict[WebSocketServerProtocol, asyncio.Queue] = {}
         self.command_bus: CommandBus = None
         self.server = None
+        self.stream_task: asyncio.Task = None
+        self.invalid_messages = 0
+        self.dropped_frames = 0
+        self._now = None  # Bound loop.time, set in start()
         
     async def start(self):
         """Start the WebSocket server and connect to command bus."""
+        if self.server is not None:
+            return
+        
+        self._now = asyncio.get_running_loop().time
         self.command_bus = await get_command_bus()
         
         # Start WebSocket server
         self.server = await websockets.serve(
             self.handle_client,
             self.host,
-            self.port
+            self.port,
+            compression=self.compression
         )
         
         # Start action streaming task
-        asyncio.create_task(self.stream_actions())
+        self.stream_task = asyncio.create_task(self.stream_actions())
         
         print(f"🌐 WebSocket server started on ws://{self.host}:{self.port}")
         
@@ -56,21 +87,21 @@ class WebSocketActionStreamer:
         """Handle a new WebSocket client connection."""
         self.clients.add(websocket)
         client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
+        writer_task = None
         
         print(f"🔌 Client connected: {client_id}")
         
         try:
-            # Send welcome message
-            welcome_action = {
-                "action": "connection_established",
-                "data": {
-                    "message": "Connected to MultiModal Assistant",
-                    "client_id": client_id
-                },
-                "id": "welcome",
-                "timestamp": asyncio.get_event_loop().time()
-            }
-            await websocket.send(json.dumps(welcome_action))
+            # Send welcome message (client_id is host:port, so needs no JSON escaping)
+            await websocket.send(_WELCOME_TEMPLATE.format(
+                client_id=client_id,
+                timestamp=self._now()
+            ))
+            
+            # Actions reach this client through its own queue and writer task
+            queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+            self.client_queues[websocket] = queue
+            writer_task = asyncio.create_task(self._client_writer(websocket, queue))
             
             # Keep connection alive and handle client messages
             async for message in websocket:
@@ -81,30 +112,44 @@ class WebSocketActionStreamer:
         except Exception as e:
             print(f"❌ Error handling client {client_id}: {e}")
         finally:
+            if writer_task:
+                writer_task.cancel()
+            self.client_queues.pop(websocket, None)
             self.clients.discard(websocket)
             
+    async def _client_writer(self, websocket: WebSocketServerProtocol, queue: asyncio.Queue):
+        """Send queued frames to one client until it disconnects."""
+        try:
+            while True:
+                frame = await queue.get()
+                await websocket.send(frame)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            print(f"❌ Error sending to client: {e}")
+        finally:
+            self.client_queues.pop(websocket, None)
+            
     async def handle_client_message(self, websocket: WebSocketServerProtocol, message: str):
         """Handle incoming messages from clients."""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             action_type = data.get("action")
             
             if action_type == "ping":
                 # Respond to ping with pong
-                pong_response = {
-                    "action": "pong",
-                    "data": {"timestamp": asyncio.get_event_loop().time()},
-                    "id": "pong"
-                }
-                await websocket.send(json.dumps(pong_response))
+                await websocket.send(_PONG_TEMPLATE.format(timestamp=self._now()))
                 
             elif action_type == "subscribe_actions":
                 # Client wants to subscribe to specific action types
                 # For now, all clients get all actions
                 pass
                 
-        except json.JSONDecodeError:
-            print(f"⚠️ Received invalid JSON from client: {message}")
+        except orjson.JSONDecodeError:
+            # Sample the log so a misbehaving client cannot flood it
+            self.invalid_messages += 1
+            if self.invalid_messages % LOG_SAMPLE_INTERVAL == 1:
+                print(f"⚠️ Received invalid JSON from client ({self.invalid_messages} total): {truncate_text(str(message))}")
         except Exception as e:
             print(f"❌ Error processing client message: {e}")
             
@@ -115,39 +160,106 @@ class WebSocketActionStreamer:
         
         try:
             while True:
-                # Get next action from command bus
-                action_json = await subscriber_queue.get()
+                # Coalesce everything already queued into one frame (a JSON array)
+                batch = await get_action_batch(subscriber_queue)
                 
                 # Broadcast to all connected clients
-                if self.clients:
-                    # Create list copy to avoid modification during iteration
-                    clients_copy = list(self.clients)
-                    
-                    await asyncio.gather(
-                        *[self.send_to_client(client, action_json) for client in clients_copy],
-                        return_exceptions=True
-                    )
+                if self.client_queues:
+                    self.broadcast("[" + ",".join(batch) + "]")
+                
+                # get() does not suspend while the queue is non-empty; let writers run
+                await asyncio.sleep(0)
                     
         except Exception as e:
             print(f"❌ Error in action streaming: {e}")
         finally:
             self.command_bus.unsubscribe(subscriber_queue)
             
-    async def send_to_client(self, client: WebSocketServerProtocol, action_json: str):
-        """Send an action to a specific client, handling connection errors."""
-        try:
-            await client.send(action_json)
-        except websockets.exceptions.ConnectionClosed:
-            # Client disconnected, remove from set
-            self.clients.discard(client)
-        except Exception as e:
-            print(f"❌ Error sending to client: {e}")
-            self.clients.discard(client)
+    def broadcast(self, frame: str):
+        """Queue one pre-encoded frame for every client; a full queue drops the frame for that client."""
+        for queue in self.client_queues.values():
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.dropped_frames += 1
 
 
 # FastAPI integration for full-featured web server
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+
+
+# Static test page, kept as bytes so requests skip the str -> UTF-8 encode
+_TEST_HTML = b"""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>MultiModal Assistant WebSocket Test</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        #messages { border: 1px solid #ccc; height: 400px; overflow-y: scroll; padding: 10px; margin: 10px 0; }
+        .message { margin: 5px 0; padding: 5px; background: #f5f5f5; border-radius: 3px; }
+        .action-speak { background: #e3f2fd; }
+        .action-progress { background: #fff3e0; }
+        .action-error { background: #ffebee; }
+    </style>
+</head>
+<body>
+    <h1>MultiModal Assistant - Real-time Actions</h1>
+    <div id="status">Connecting...</div>
+    <div id="messages"></div>
+    
+    <script>
+        const ws = new WebSocket('ws://localhost:8000/ws');
+        const messages = document.getElementById('messages');
+        const status = document.getElementById('status');
+        
+        ws.onopen = function() {
+            status.textContent = 'Connected';
+            status.style.color = 'green';
+        };
+        
+        ws.onmessage = function(event) {
+            // Actions arrive batched as a JSON array; control messages are single objects
+            const payload = JSON.parse(event.data);
+            const actions = Array.isArray(payload) ? payload : [payload];
+            for (const action of actions) {
+                const div = document.createElement('div');
+                div.className = `message action-${action.action}`;
+                div.innerHTML = `
+                    <strong>${action.action}</strong> - ${action.timestamp || 'now'}<br>
+                    <small>Source: ${action.source || 'unknown'}</small><br>
+                    <pre>${JSON.stringify(action.data, null, 2)}</pre>
+                `;
+                messages.appendChild(div);
+            }
+            messages.scrollTop = messages.scrollHeight;
+        };
+        
+        ws.onclose = function() {
+            status.textContent = 'Disconnected';
+            status.style.color = 'red';
+        };
+        
+        ws.onerror = function(error) {
+            status.textContent = 'Error';
+            status.style.color = 'red';
+        };
+        
+        // Send ping every 30 seconds
+        setInterval(() => {
+            if (ws.readyState === WebSocket.OPEN) {
+                ws.send(JSON.stringify({action: 'ping'}));
+            }
+        }, 30000);
+    </script>
+</body>
+</html>
+"""
+_TEST_HTML_HEADERS = {
+    "Cache-Control": "public, max-age=3600",
+    "ETag": f'"{hashlib.sha1(_TEST_HTML).hexdigest()}"'
+}
 
 
 class FastAPIWebSocketStreamer:
@@ -156,57 +268,104 @@ class FastAPIWebSocketStreamer:
     def __init__(self):
         self.app = FastAPI(title="MultiModal Assistant WebSocket API")
         self.clients: Set[WebSocket] = set()
+        self.client_queues: Dict[WebSocket, asyncio.Queue] = {}
         self.command_bus: CommandBus = None
+        self.stream_task: asyncio.Task = None
+        self.invalid_messages = 0
+        self.dropped_frames = 0
         
         # Add WebSocket endpoint
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             await self.handle_websocket(websocket)
             
+        # Add health endpoint exposing command bus backpressure counters
+        @self.app.get("/health")
+        async def get_health():
+            return {
+                "status": "ok",
+                "clients": len(self.clients),
+                "dropped_frames": self.dropped_frames,
+                "command_bus": self.command_bus.get_stats() if self.command_bus else None
+            }
+            
         # Add simple test page
         @self.app.get("/")
-        async def get_test_page():
-            return HTMLResponse(self.get_test_html())
+        async def get_test_page(request: Request):
+            if request.headers.get("if-none-match") == _TEST_HTML_HEADERS["ETag"]:
+                return Response(status_code=304, headers=_TEST_HTML_HEADERS)
+            return Response(content=_TEST_HTML, media_type="text/html", headers=_TEST_HTML_HEADERS)
             
     async def start_command_bus_streaming(self):
         """Initialize command bus connection and start streaming."""
+        # A second streaming task would subscribe again and send every action twice
+        if self.stream_task is not None and not self.stream_task.done():
+            return
+        
         self.command_bus = await get_command_bus()
-        asyncio.create_task(self.stream_actions())
+        self.stream_task = asyncio.create_task(self.stream_actions())
         
     async def handle_websocket(self, websocket: WebSocket):
         """Handle WebSocket connections."""
         await websocket.accept()
         self.clients.add(websocket)
+        writer_task = None
         
         try:
             # Send welcome message
-            welcome = {
-                "action": "connection_established",
-                "data": {"message": "Connected to MultiModal Assistant"},
-                "id": "welcome"
-            }
-            await websocket.send_json(welcome)
+            await websocket.send_text(_WELCOME_MESSAGE)
+            
+            # Actions reach this client through its own queue and writer task
+            queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+            self.client_queues[websocket] = queue
+            writer_task = asyncio.create_task(self._client_writer(websocket, queue))
             
-            # Listen for client messages
+            # Listen for client messages; only text frames carry JSON, binary
+            # frames are ignored without being decoded
             while True:
-                data = await websocket.receive_json()
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                
+                text = message.get("text")
+                if text is None:
+                    continue
+                
+                try:
+                    data = orjson.loads(text)
+                except orjson.JSONDecodeError:
+                    self.invalid_messages += 1
+                    if self.invalid_messages % LOG_SAMPLE_INTERVAL == 1:
+                        print(f"⚠️ Received invalid JSON from client ({self.invalid_messages} total): {truncate_text(text)}")
+                    continue
                 await self.handle_client_message(websocket, data)
                 
         except WebSocketDisconnect:
-            self.clients.discard(websocket)
+            pass
         except Exception as e:
             print(f"❌ WebSocket error: {e}")
+        finally:
+            if writer_task:
+                writer_task.cancel()
+            self.client_queues.pop(websocket, None)
             self.clients.discard(websocket)
             
+    async def _client_writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued frames to one client until it disconnects."""
+        try:
+            while True:
+                frame = await queue.get()
+                await websocket.send_text(frame)
+        except Exception:
+            # Stop writing; the receive loop cleans up the connection
+            self.client_queues.pop(websocket, None)
+            
     async def handle_client_message(self, websocket: WebSocket, data: Dict[str, Any]):
         """Handle messages from WebSocket clients."""
         action = data.get("action")
         
         if action == "ping":
-            await websocket.send_json({
-                "action": "pong",
-                "data": {"timestamp": asyncio.get_event_loop().time()}
-            })
+            await websocket.send_text(_PONG_TEMPLATE.format(timestamp=asyncio.get_running_loop().time()))
             
     async def stream_actions(self):
         """Stream command bus actions to WebSocket clients."""
@@ -217,93 +376,30 @@ class FastAPIWebSocketStreamer:
         
         try:
             while True:
-                action_json = await subscriber_queue.get()
-                action_data = json.loads(action_json)
+                # Coalesce everything already queued into one frame (a JSON array)
+                batch = await get_action_batch(subscriber_queue)
                 
                 # Send to all connected clients
-                if self.clients:
-                    clients_copy = list(self.clients)
-                    await asyncio.gather(
-                        *[self.send_to_client(client, action_data) for client in clients_copy],
-                        return_exceptions=True
-                    )
+                if self.client_queues:
+                    # Actions are already serialized; splice them into one JSON
+                    # array without decoding, and every client gets the same frame
+                    self.broadcast("[" + ",".join(batch) + "]")
+                
+                # get() does not suspend while the queue is non-empty; let writers run
+                await asyncio.sleep(0)
                     
         except Exception as e:
             print(f"❌ Error streaming actions: {e}")
         finally:
             self.command_bus.unsubscribe(subscriber_queue)
             
-    async def send_to_client(self, client: WebSocket, action_data: Dict[str, Any]):
-        """Send action to specific client."""
-        try:
-            await client.send_json(action_data)
-        except Exception:
-            self.clients.discard(client)
-            
-    def get_test_html(self) -> str:
-        """Simple test page for WebSocket functionality."""
-        return """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>MultiModal Assistant WebSocket Test</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        #messages { border: 1px solid #ccc; height: 400px; overflow-y: scroll; padding: 10px; margin: 10px 0; }
-        .message { margin: 5px 0; padding: 5px; background: #f5f5f5; border-radius: 3px; }
-        .action-speak { background: #e3f2fd; }
-        .action-progress { background: #fff3e0; }
-        .action-error { background: #ffebee; }
-    </style>
-</head>
-<body>
-    <h1>MultiModal Assistant - Real-time Actions</h1>
-    <div id="status">Connecting...</div>
-    <div id="messages"></div>
-    
-    <script>
-        const ws = new WebSocket('ws://localhost:8000/ws');
-        const messages = document.getElementById('messages');
-        const status = document.getElementById('status');
-        
-        ws.onopen = function() {
-            status.textContent = 'Connected';
-            status.style.color = 'green';
-        };
-        
-        ws.onmessage = function(event) {
-            const action = JSON.parse(event.data);
-            const div = document.createElement('div');
-            div.className = `message action-${action.action}`;
-            div.innerHTML = `
-                <strong>${action.action}</strong> - ${action.timestamp || 'now'}<br>
-                <small>Source: ${action.source || 'unknown'}</small><br>
-                <pre>${JSON.stringify(action.data, null, 2)}</pre>
-            `;
-            messages.appendChild(div);
-            messages.scrollTop = messages.scrollHeight;
-        };
-        
-        ws.onclose = function() {
-            status.textContent = 'Disconnected';
-            status.style.color = 'red';
-        };
-        
-        ws.onerror = function(error) {
-            status.textContent = 'Error';
-            status.style.color = 'red';
-        };
-        
-        // Send ping every 30 seconds
-        setInterval(() => {
-            if (ws.readyState === WebSocket.OPEN) {
-                ws.send(JSON.stringify({action: 'ping'}));
-            }
-        }, 30000);
-    </script>
-</body>
-</html>
-        """
+    def broadcast(self, frame: str):
+        """Queue one pre-encoded frame for every client; a full queue drops the frame for that client."""
+        for queue in self.client_queues.values():
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.dropped_frames += 1
 
 
 # Global WebSocket streamer instance
@@ -342,4 +438,5 @@ if __name__ == "__main__":
         server = uvicorn.Server(config)
         await server.serve()
         
+    configure_event_loop()
     asyncio.run(main())
\ No newline at end of file
@@ -5,11 +5,21 @@ Provides multi-agent coordination and task routing.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Type
-from abc import ABC, abstractmethod
+import re
+from collections import ChainMap
+from functools import lru_cache
+from graphlib import TopologicalSorter
+from typing import Dict, Any, List, Optional, Protocol, Sequence, Tuple, Type
 from enum import Enum
 from agents import BaseAgent, PlannerAgent, WeatherAgent, CalendarAgent
-from bus import get_command_bus, ActionTypes
+from bus import get_command_bus, ActionTypes, truncate_text
+
+
+# Status emitted when any workflow call finishes; serialized on emit, so safe to share
+_COMPLETED_STATUS = {"workflow": "completed"}
+
+# Structured task groups (Python 3.11+); older versions fall back to gather
+_TASK_GROUP = getattr(asyncio, "TaskGroup", None)
 
 
 class WorkflowTopology(Enum):
@@ -19,20 +29,19 @@ class WorkflowTopology(Enum):
     PARALLEL = "parallel"  # All agents process simultaneously
 
 
-class Agent(ABC):
+class Agent(Protocol):
     """
     ADK-compatible agent interface.
-    Wrapper around our BaseAgent to match ADK patterns.
+    Structural, so BaseAgent and ADK agents match it without inheriting from it.
+    Only name and run() are required; consumes, produces, wants_flat_context
+    and max_concurrency are optional and default to BaseAgent's values.
     """
     
-    def __init__(self, name: str = None):
-        self.name = name or self.__class__.__name__
-        self.tools = []
-        
-    @abstractmethod
+    name: str
+    
     async def run(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute the agent's task."""
-        pass
+        ...
 
 
 class Workflow:
@@ -41,17 +50,42 @@ class Workflow:
     Coordinates agent execution based on topology and routing rules.
     """
     
-    def __init__(self, agents: List[BaseAgent], topology: str = "star"):
+    __slots__ = (
+        "agents", "topology", "command_bus", "planner", "agent_concurrency",
+        "_router", "_agent_list", "_agent_names", "_agents_by_type",
+        "_chain_ancestors", "_start_status", "_execute_topology", "_agent_semaphores"
+    )
+    
+    def __init__(self, agents: List[BaseAgent], topology: str = "star", agent_concurrency: int = 8):
         self.agents = {agent.name: agent for agent in agents}
-        self.topology = WorkflowTopology(topology)
+        try:
+            self.topology = WorkflowTopology(topology)
+        except ValueError:
+            valid = ", ".join(t.value for t in WorkflowTopology)
+            raise ValueError(f"Unsupported topology: {topology!r} (expected one of: {valid})") from None
         self.command_bus = None
-        self.planner = None
+        self._refresh_agents()
+        # Shares self.agents, so it follows add_agent/remove_agent
+        self._router = TaskRouter(self.agents)
+        
+        # Bound concurrent runs per agent so fan-out cannot exceed provider rate
+        # limits; agents that declare a lower max_concurrency get that instead
+        self.agent_concurrency = agent_concurrency
+        self._agent_semaphores: Dict[str, asyncio.Semaphore] = {
+            agent.name: self._new_agent_semaphore(agent) for agent in self._agent_list
+        }
         
-        # Find planner agent
-        for agent in agents:
-            if isinstance(agent, PlannerAgent):
-                self.planner = agent
-                break
+        # The planner is found by _refresh_agents
+        if self.topology == WorkflowTopology.STAR and self.planner is None:
+            raise ValueError("Star topology requires a PlannerAgent")
+        
+        # Resolve the topology handler once; the topology is fixed at construction
+        topology_handlers = {
+            WorkflowTopology.STAR: self._execute_star_topology,
+            WorkflowTopology.CHAIN: self._execute_chain_topology,
+            WorkflowTopology.PARALLEL: self._execute_parallel_topology
+        }
+        self._execute_topology = topology_handlers[self.topology]
     
     async def __call__(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -68,35 +102,47 @@ class Workflow:
         if self.command_bus is None:
             self.command_bus = await get_command_bus()
         
+        emit = self.command_bus.emit
+        
         # Emit workflow start
-        self.command_bus.emit(ActionTypes.UPDATE_STATUS, {
-            "workflow": "started",
-            "task": task[:100] + "..." if len(task) > 100 else task,
-            "topology": self.topology.value,
-            "agents": list(self.agents.keys())
-        })
+        start_status = self._start_status.copy()
+        start_status["task"] = truncate_text(task)
+        emit(ActionTypes.UPDATE_STATUS, start_status)
         
+        # Exactly one terminal event per call: "completed" or "failed"
         try:
-            if self.topology == WorkflowTopology.STAR:
-                return await self._execute_star_topology(task, context)
-            elif self.topology == WorkflowTopology.CHAIN:
-                return await self._execute_chain_topology(task, context)
-            elif self.topology == WorkflowTopology.PARALLEL:
-                return await self._execute_parallel_topology(task, context)
-            else:
-                raise ValueError(f"Unsupported topology: {self.topology}")
-                
+            result = await self._execute_topology(task, context)
         except Exception as e:
-            error_result = {"error": f"Workflow execution failed: {str(e)}"}
-            self.command_bus.emit(ActionTypes.ERROR, {
+            emit(ActionTypes.ERROR, {
                 "workflow": "failed",
                 "error": str(e)
             })
-            return error_result
-        finally:
-            self.command_bus.emit(ActionTypes.UPDATE_STATUS, {
-                "workflow": "completed"
-            })
+            return {"error": f"Workflow execution failed: {str(e)}"}
+        
+        emit(ActionTypes.UPDATE_STATUS, _COMPLETED_STATUS)
+        return result
+    
+    def _refresh_agents(self):
+        """Rebuild the state derived from the agent set; called whenever it changes."""
+        self._agent_list = tuple(self.agents.values())
+        self._agent_names = tuple(self.agents)
+        # Agents by concrete class, first of each class wins; kept in sync with the
+        # agent set so role lookups such as the planner need no scan
+        self._agents_by_type: Dict[type, BaseAgent] = {}
+        for agent in self._agent_list:
+            self._agents_by_type.setdefault(type(agent), agent)
+        self.planner = self.get_agent_by_type(PlannerAgent)
+        # Chain dependencies only change with the agent set, not per call
+        self._chain_ancestors = (
+            _build_chain_dependencies(self._agent_list) if self.topology == WorkflowTopology.CHAIN else {}
+        )
+        # Start event payload; "task" is set on a copy for each call
+        self._start_status = {
+            "workflow": "started",
+            "task": None,
+            "topology": self.topology.value,
+            "agents": self._agent_names
+        }
     
     async def _execute_star_topology(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -109,38 +155,80 @@ class Workflow:
         Returns:
             Result from planner agent
         """
-        if not self.planner:
-            raise ValueError("Star topology requires a PlannerAgent")
-        
         # In star topology, the planner orchestrates everything
         # It may delegate to other agents internally
-        return await self.planner.run(task, context)
+        return await self._run_agent(self.planner, task, context)
     
     async def _execute_chain_topology(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Execute chain topology: sequential agent processing.
+        Execute chain topology: agents run in dependency order. Each agent's
+        context layers the results of every earlier agent that has finished by
+        the time it starts over the caller's context; that always includes the
+        upstream agents it consumes from. An agent that consumes nothing may
+        start before earlier agents finish and then does not see their results.
         
         Args:
             task: Task to execute
-            context: Additional context
+            context: Additional context; read but never modified
             
         Returns:
-            Final result from chain execution
+            Final result from chain execution, as a new dict
         """
-        current_task = task
-        current_context = context or {}
+        agents = self._agent_list
+        ancestors = self._chain_ancestors
+        base_context = context or {}
+        results: Dict[int, Dict[str, Any]] = {}
         
-        for agent in self.agents.values():
-            result = await agent.run(current_task, current_context)
-            
-            # Update context with result for next agent
-            current_context.update(result)
-            
-            # If agent produced formatted response, use it as next task
-            if "formatted_response" in result:
-                current_task = result["formatted_response"]
+        # Each agent starts as soon as the upstream agents whose output it
+        # consumes have finished, rather than waiting for everything before it
+        sorter = TopologicalSorter(ancestors)
+        sorter.prepare()
+        running: Dict[asyncio.Future, int] = {}
+        try:
+            while sorter.is_active():
+                for index in sorter.get_ready():
+                    agent = agents[index]
+                    upstream = [results[i] for i in reversed(ancestors[index])]
+                    
+                    # Consumers take the latest upstream formatted response as their task
+                    agent_task = task
+                    if "formatted_response" in getattr(agent, "consumes", BaseAgent.consumes):
+                        agent_task = next(
+                            (r["formatted_response"] for r in upstream if "formatted_response" in r),
+                            task
+                        )
+                    
+                    # Finished earlier results are layered over the caller's context instead
+                    # of copied in, which also leaves the caller's dict unmodified; agents
+                    # that need a real dict get one flattened copy
+                    finished_earlier = [results[i] for i in reversed(range(index)) if i in results]
+                    agent_context = ChainMap(*finished_earlier, base_context)
+                    if getattr(agent, "wants_flat_context", BaseAgent.wants_flat_context):
+                        agent_context = dict(agent_context)
+                    run = self._run_agent(agent, agent_task, agent_context)
+                    running[asyncio.ensure_future(run)] = index
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                error = None
+                for finished in done:
+                    index = running.pop(finished)
+                    # Retrieve every outcome so no failure goes unreported
+                    if finished.exception() is not None:
+                        error = error or finished.exception()
+                        continue
+                    results[index] = finished.result()
+                    sorter.done(index)
+                if error is not None:
+                    raise error
+        finally:
+            # A failed agent ends the chain; stop its siblings and wait for them to unwind
+            for pending in running:
+                pending.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
         
-        return current_context
+        # Merge in chain order so later agents win, as in a serial run
+        return dict(ChainMap(*(results[i] for i in reversed(range(len(agents)))), base_context))
     
     async def _execute_parallel_topology(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -153,57 +241,170 @@ class Workflow:
         Returns:
             Combined results from all agents
         """
-        # Run all agents concurrently
-        tasks = [
-            agent.run(task, context) 
-            for agent in self.agents.values()
-        ]
+        # Run all agents concurrently; each reports as soon as it finishes
+        # rather than waiting for the slowest
+        # Keyword-routable tasks only need their specialist; the rest fan out to everyone
+        candidates = self._router.route_candidates(task)
+        if len(candidates) < len(self._agent_list):
+            self.command_bus.emit(ActionTypes.UPDATE_STATUS, {
+                "workflow": "routed",
+                "agents": candidates,
+                "skipped": [name for name in self._agent_names if name not in candidates]
+            })
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        runs = [self._run_and_report(self.agents[name], task, context, results, errors) for name in candidates]
+        if _TASK_GROUP is not None:
+            async with _TASK_GROUP() as group:
+                for run in runs:
+                    group.create_task(run)
+        else:
+            await asyncio.gather(*runs)
         
-        # Combine results
+        # Combine results in agent order
         combined_result = {
-            "parallel_results": {},
-            "success": True,
-            "errors": []
+            "parallel_results": {name: results[name] for name in candidates if name in results},
+            "success": not errors,
+            "errors": [{"agent": name, "error": errors[name]} for name in candidates if name in errors]
         }
         
-        for agent_name, result in zip(self.agents.keys(), results):
-            if isinstance(result, Exception):
-                combined_result["errors"].append({
-                    "agent": agent_name,
-                    "error": str(result)
-                })
-                combined_result["success"] = False
-            else:
-                combined_result["parallel_results"][agent_name] = result
-        
         return combined_result
     
+    async def _run_agent(self, agent: BaseAgent, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Run an agent, waiting for a free slot if it is already at its concurrency limit.
+        
+        Args:
+            agent: Agent to run
+            task: Task to execute
+            context: Additional context
+            
+        Returns:
+            Result from the agent
+        """
+        semaphore = self._agent_semaphores.get(agent.name)
+        if semaphore is None:
+            semaphore = self._agent_semaphores[agent.name] = self._new_agent_semaphore(agent)
+        
+        async with semaphore:
+            return await agent.run(task, context)
+    
+    def _new_agent_semaphore(self, agent: BaseAgent) -> asyncio.Semaphore:
+        """Concurrency limit for an agent: its own max_concurrency if lower than the workflow's."""
+        limit = getattr(agent, "max_concurrency", None)
+        return asyncio.Semaphore(min(limit, self.agent_concurrency) if limit else self.agent_concurrency)
+    
+    async def _run_and_report(self, agent: BaseAgent, task: str, context: Optional[Dict[str, Any]],
+                              results: Dict[str, Any], errors: Dict[str, str]) -> None:
+        """
+        Run one agent of a parallel workflow and report it as soon as it completes.
+        
+        Args:
+            agent: Agent to run
+            task: Task to execute
+            context: Additional context
+            results: Receives the agent's result under its name
+            errors: Receives the agent's error message under its name if it raised
+        """
+        try:
+            result = await self._run_agent(agent, task, context)
+        except Exception as e:
+            errors[agent.name] = str(e)
+            return
+        
+        results[agent.name] = result
+        progress = {"agent": agent.name, "status": "completed"}
+        if isinstance(result, dict) and "formatted_response" in result:
+            progress["message"] = truncate_text(result["formatted_response"])
+        self.command_bus.emit(ActionTypes.SHOW_PROGRESS, progress)
+    
     def add_agent(self, agent: BaseAgent):
         """Add an agent to the workflow."""
         self.agents[agent.name] = agent
+        self._refresh_agents()
+        self._agent_semaphores[agent.name] = self._new_agent_semaphore(agent)
     
     def remove_agent(self, agent_name: str):
         """Remove an agent from the workflow."""
         if agent_name in self.agents:
+            # A star workflow cannot run without its planner; refuse rather than fail every call
+            if self.topology == WorkflowTopology.STAR and self.agents[agent_name] is self.planner:
+                remaining = [agent for name, agent in self.agents.items() if name != agent_name]
+                if not any(isinstance(agent, PlannerAgent) for agent in remaining):
+                    raise ValueError("Star topology requires a PlannerAgent")
             del self.agents[agent_name]
+            self._refresh_agents()
+            self._agent_semaphores.pop(agent_name, None)
     
     def get_agent(self, agent_name: str) -> Optional[BaseAgent]:
         """Get an agent by name."""
         return self.agents.get(agent_name)
     
+    def get_agent_by_type(self, agent_type: Type[BaseAgent]) -> Optional[BaseAgent]:
+        """
+        Get an agent by class.
+        
+        Args:
+            agent_type: Agent class to look for; subclasses also match
+            
+        Returns:
+            An agent of that class, or None if the workflow has none
+        """
+        agent = self._agents_by_type.get(agent_type)
+        if agent is None:
+            agent = next((a for t, a in self._agents_by_type.items() if issubclass(t, agent_type)), None)
+        return agent
+    
     def list_agents(self) -> List[str]:
         """List all agent names."""
         return list(self.agents.keys())
 
 
+# Routing keywords, matched as substrings of the lowercased task; the
+# named group of each match identifies its category in a single scan
+_ROUTE_KEYWORDS_RE = re.compile(
+    "(?P<weather>weather|temperature|forecast|climate)"
+    "|(?P<calendar>calendar|schedule|meeting|appointment|event)"
+)
+
+# Distinct lowercased task strings whose routing decision is remembered
+ROUTE_CACHE_SIZE = 4096
+
+# Agent that handles each routing category
+_ROUTE_CATEGORY_AGENTS = {"weather": "WeatherAgent", "calendar": "CalendarAgent"}
+
+
+@lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def _route_categories(task_lower: str) -> frozenset:
+    """Routing categories mentioned in a lowercased task; a pure function of the text, so cached."""
+    return frozenset(match.lastgroup for match in _ROUTE_KEYWORDS_RE.finditer(task_lower))
+
+
+def _route_task(task_lower: str) -> str:
+    """Keyword routing decision for a lowercased task."""
+    # Simple keyword-based routing
+    # In production, use ML models for better routing
+    categories = _route_categories(task_lower)
+    # Weather outranks calendar
+    if "weather" in categories:
+        return "WeatherAgent"
+    
+    if "calendar" in categories:
+        return "CalendarAgent"
+    
+    # Default to planner for general queries
+    return "PlannerAgent"
+
+
 class TaskRouter:
     """
     Intelligent task routing to appropriate agents.
     Analyzes tasks and routes to the best-suited agent.
     """
     
+    __slots__ = ("agents",)
+    
     def __init__(self, agents: Dict[str, BaseAgent]):
         self.agents = agents
         
@@ -217,19 +418,52 @@ class TaskRouter:
         Returns:
             Name of the best-suited agent
         """
-        task_lower = task.lower()
-        
-        # Simple keyword-based routing
-        # In production, use ML models for better routing
-        if any(word in task_lower for word in ["weather", "temperature", "forecast", "climate"]):
-            return "WeatherAgent"
+        return _route_task(task.lower())
+    
+    def route_candidates(self, task: str) -> List[str]:
+        """
+        Choose which agents should work on a task.
         
-        elif any(word in task_lower for word in ["calendar", "schedule", "meeting", "appointment", "event"]):
-            return "CalendarAgent"
+        Args:
+            task: Task description
+            
+        Returns:
+            The specialist's name when keywords point at exactly one category,
+            otherwise every agent's name
+        """
+        # Mixed tasks ("weather and my schedule") need every specialist they mention
+        categories = _route_categories(task.lower())
+        if len(categories) == 1:
+            agent_name = _ROUTE_CATEGORY_AGENTS[next(iter(categories))]
+            if agent_name in self.agents:
+                return [agent_name]
+        return list(self.agents)
+
+
+def _build_chain_dependencies(agents: Sequence[Agent]) -> Dict[int, Tuple[int, ...]]:
+    """
+    Work out which earlier chain agents each agent has to wait for.
+    An agent depends on every earlier agent that produces a key it consumes,
+    and transitively on whatever those agents depend on. Agents that do not
+    declare consumes/produces get BaseAgent's defaults.
+    
+    Args:
+        agents: Agents in chain order
         
-        else:
-            # Default to planner for general queries
-            return "PlannerAgent"
+    Returns:
+        Mapping of agent index to the indices of its upstream agents, in chain order
+    """
+    consumes = [getattr(agent, "consumes", BaseAgent.consumes) for agent in agents]
+    produces = [getattr(agent, "produces", BaseAgent.produces) for agent in agents]
+    ancestors: Dict[int, Tuple[int, ...]] = {}
+    for index in range(len(agents)):
+        upstream = set()
+        for earlier in range(index):
+            if produces[earlier] & consumes[index]:
+                upstream.add(earlier)
+                upstream.update(ancestors[earlier])
+        ancestors[index] = tuple(sorted(upstream))
+    return ancestors
 
 
 def create_default_workflow() -> Workflow:
@@ -253,11 +487,15 @@ def create_default_workflow() -> Workflow:
 
 
 # ADK-compatible helper functions
-def create_workflow(agents: List[BaseAgent], topology: str = "star") -> Workflow:
+def create_workflow(agents: List[BaseAgent], topology: str = "star", agent_concurrency: int = 8) -> Workflow:
     """Create a workflow with the specified agents and topology."""
-    return Workflow(agents, topology)
+    return Workflow(agents, topology, agent_concurrency)
 
 
 async def execute_workflow(workflow: Workflow, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Execute a workflow with the given task."""
+    """
+    Execute a workflow with the given task.
+    Callers that own the event loop should call bus.configure_event_loop() before asyncio.run(),
+    and may call bus.install_eager_task_factory() once at startup.
+    """
     return await workflow(task, context)
\ No newline at end of file